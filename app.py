@@ -30,7 +30,6 @@ from __future__ import annotations
 import os
 import io
 import json
-import ssl
 import re
 import hmac
 import base64
@@ -38,28 +37,40 @@ import secrets
 import hashlib
 import time
 import copy
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from textwrap import wrap
 from urllib.parse import urlparse
+import certifi
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request, AuthorizedSession
+from requests.adapters import HTTPAdapter
 # Optional  client (keeps app runnable even if supabase package is not installed)
 try:
     from supabase import create_client  # type: ignore
 except Exception:
     create_client = None  # type: ignore
+# Optional HTTP/2 transport for YouTube Analytics (falls back to requests if httpx/h2 missing)
+try:
+    import httpx  # type: ignore
+except Exception:
+    httpx = None  # type: ignore
 # ---------------------------------------------------------------------
 # Bootstrap / config
 # ---------------------------------------------------------------------
-ssl._create_default_https_context = ssl._create_unverified_context
+# Verify TLS against certifi's CA bundle. Behind a TLS-intercepting proxy, set SSL_CERT_FILE /
+# REQUESTS_CA_BUNDLE to your own bundle instead of disabling verification.
+os.environ.setdefault("SSL_CERT_FILE", certifi.where())
+os.environ.setdefault("REQUESTS_CA_BUNDLE", certifi.where())
 load_dotenv()
 os.environ.pop("HTTP_PROXY", None)
 os.environ.pop("HTTPS_PROXY", None)
@@ -808,10 +819,31 @@ def _gs_write_licenses(store: dict) -> bool:
         return False
 
 
+# In-process cache of the license sheet: each rerun calls _lic_load several times,
+# and each uncached call is a full Sheets read. _LIC_LOCK only guards the cache dict (held for
+# microseconds); _LIC_WRITE_LOCK serialises the slow Sheets writes so readers never wait on them.
+_LIC_CACHE_TTL = 15.0
+_LIC_CACHE: dict = {"ts": 0.0, "data": {}, "gen": 0}
+_LIC_LOCK = threading.Lock()
+_LIC_WRITE_LOCK = threading.Lock()
+
 def _lic_load() -> dict:
-    gs = _gs_fetch_licenses()
-    if not isinstance(gs, dict):
-        gs = {}
+    with _LIC_LOCK:
+        cached = _LIC_CACHE["data"] if time.monotonic() - _LIC_CACHE["ts"] < _LIC_CACHE_TTL else None
+        gen = _LIC_CACHE["gen"]
+    if cached is None:
+        gs = _gs_fetch_licenses()
+        if not isinstance(gs, dict):
+            gs = {}
+        if gs:
+            # Don't pin an empty/failed read, or one that raced a write (gen moved on), in the cache
+            with _LIC_LOCK:
+                if _LIC_CACHE["gen"] == gen:
+                    _LIC_CACHE["data"] = copy.deepcopy(gs)
+                    _LIC_CACHE["ts"] = time.monotonic()
+    else:
+        # Callers mutate the store before saving, so never hand out the cached dict itself
+        gs = copy.deepcopy(cached)
     try:
         st.session_state["_lic_snapshot"] = copy.deepcopy(gs)
     except Exception:
@@ -819,7 +851,12 @@ def _lic_load() -> dict:
     return gs
 
 def _lic_save(store: dict):
-    ok = _gs_write_licenses(store)
+    with _LIC_WRITE_LOCK:
+        ok = _gs_write_licenses(store)
+        # Invalidate rather than cache `store`: it may predate another session's save
+        with _LIC_LOCK:
+            _LIC_CACHE["ts"] = 0.0
+            _LIC_CACHE["gen"] += 1
     if not ok:
         st.error("License write failed: could not save to Google Sheets. No changes were applied.")
         st.stop()
@@ -1356,9 +1393,39 @@ elif st.session_state.get("reseller_mode", False):
 # ---------------------------------------------------------------------
 # YouTube helpers
 # ---------------------------------------------------------------------
+# Built once per process and shared by every session/rerun (read-only API calls)
 @st.cache_resource(show_spinner=False)
 def yt_key_service():
     return build("youtube", "v3", developerKey=YOUTUBE_API_KEY, cache_discovery=False)
+def _token_expires_soon(creds, margin: timedelta = timedelta(minutes=5)) -> bool:
+    # google-auth stores expiry as naive UTC
+    exp = getattr(creds, "expiry", None)
+    if exp is None:
+        return False
+    return exp - datetime.now(timezone.utc).replace(tzinfo=None) < margin
+class _Http2AnalyticsSession:
+    """AuthorizedSession stand-in over an httpx HTTP/2 client. Only .get() is needed (yta_reports)."""
+    def __init__(self, creds, client):
+        self._creds = creds
+        self._client = client
+        self._lock = threading.Lock()
+    def get(self, url: str, params: dict | None = None, timeout: float = 60):
+        with self._lock:
+            if not self._creds.valid or _token_expires_soon(self._creds):
+                self._creds.refresh(Request())
+            headers: dict = {}
+            self._creds.apply(headers)
+        return self._client.get(url, params=params, headers=headers, timeout=timeout)
+def _http2_session(creds):
+    """HTTP/2 (multiplexed) analytics session if httpx + h2 are installed, else None."""
+    if httpx is None:
+        return None
+    try:
+        client = httpx.Client(http2=True, headers={"Accept-Encoding": "gzip"})
+    except ImportError:
+        # httpx without the h2 extra
+        return None
+    return _Http2AnalyticsSession(creds, client)
 @st.cache_resource(show_spinner=False)
 def yt_oauth_clients():
     if not os.path.exists(CLIENT_FILE):
@@ -1366,16 +1433,26 @@ def yt_oauth_clients():
     creds = None
     if os.path.exists(TOKEN_FILE):
         creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
+    # Only refresh when the token is invalid or about to expire (<5 min left)
+    if creds and creds.refresh_token and (not creds.valid or _token_expires_soon(creds)):
+        creds.refresh(Request())
+        with open(TOKEN_FILE, "w", encoding="utf-8") as f:
+            f.write(creds.to_json())
+    elif not creds or not creds.valid:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        flow = InstalledAppFlow.from_client_secrets_file(CLIENT_FILE, SCOPES)
+        creds = flow.run_local_server(port=0)
         with open(TOKEN_FILE, "w", encoding="utf-8") as f:
             f.write(creds.to_json())
     youtube = build("youtube", "v3", credentials=creds, cache_discovery=False)
-    session = AuthorizedSession(creds)
+    session = _http2_session(creds)
+    if session is None:
+        session = AuthorizedSession(creds)
+        # Keep-alive pool shared by every yta_reports call in this process
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = "gzip"
     return youtube, session
 def parse_channel_or_id(s: str) -> str:
     s = (s or "").strip()
@@ -1384,7 +1461,52 @@ def parse_channel_or_id(s: str) -> str:
     if "youtube.com" in s and "/channel/" in s:
         return s.split("/channel/")[1].split("/")[0]
     return s
-@st.cache_data(show_spinner=False, ttl=120)
+# ETag revalidation for Data API list calls: once a cache_data ttl lapses, an unchanged resource
+# comes back as 304 and we reuse the stored payload. Shared by every tab in the process, so it is
+# a bounded LRU (entry count + age ceiling) holding slimmed payloads only.
+_ETAGS: OrderedDict = OrderedDict()
+_ETAGS_LOCK = threading.Lock()
+_ETAGS_MAX = 512
+_ETAGS_MAX_AGE_S = 6 * 3600
+_ETAG_SNIPPET_DROP = ("thumbnails", "localized")
+def _etag_slim(resp: dict) -> dict:
+    """Just what callers read on a 304: items (minus thumbnails/localized) and nextPageToken."""
+    items = []
+    for it in resp.get("items", []):
+        sn = it.get("snippet")
+        if sn:
+            it = {**it, "snippet": {k: v for k, v in sn.items() if k not in _ETAG_SNIPPET_DROP}}
+        items.append(it)
+    slim = {"items": items}
+    if resp.get("nextPageToken"):
+        slim["nextPageToken"] = resp["nextPageToken"]
+    return slim
+def _execute_etag(req, key: tuple) -> dict:
+    now = time.monotonic()
+    with _ETAGS_LOCK:
+        hit = _ETAGS.get(key)
+        if hit and now - hit[2] > _ETAGS_MAX_AGE_S:
+            del _ETAGS[key]
+            hit = None
+        elif hit:
+            _ETAGS.move_to_end(key)
+    if hit:
+        req.headers["If-None-Match"] = hit[0]
+    try:
+        resp = req.execute()
+    except HttpError as e:
+        if hit and e.resp.status == 304:
+            return hit[1]
+        raise
+    if resp.get("etag"):
+        with _ETAGS_LOCK:
+            _ETAGS[key] = (resp["etag"], _etag_slim(resp), now)
+            _ETAGS.move_to_end(key)
+            while len(_ETAGS) > _ETAGS_MAX:
+                _ETAGS.popitem(last=False)
+    return resp
+# Handle -> id is stable. cache_data also memoises None, so a bad handle isn't re-searched each rerun
+@st.cache_data(show_spinner=False, ttl=3600)
 def resolve_channel_id(_yt, text: str) -> str | None:
     t = (text or "").strip()
     if t.startswith("UC"):
@@ -1401,24 +1523,22 @@ def resolve_channel_id(_yt, text: str) -> str | None:
     r = _yt.search().list(part="snippet", q=t, type="channel", maxResults=1).execute()
     it = r.get("items", [])
     return it[0]["snippet"]["channelId"] if it else None
-@st.cache_data(show_spinner=False, ttl=120)
+# Uploads playlist id is stable, but ids from parse_channel_or_id may be junk (cached as None),
+# so keep it in memory with a ttl and a size cap rather than persisting every miss to disk
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=1024)
 def channel_upload_playlist_id(_yt, channel_id: str) -> str | None:
-    ch = _yt.channels().list(part="contentDetails", id=channel_id).execute()
-    items = ch.get("items", [])
-    if not items:
-        return None
-    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    # Shares the channels.list call made by fetch_channel_meta (same cache entry)
+    return fetch_channel_meta(_yt, channel_id).get("uploads_playlist")
 @st.cache_data(show_spinner=False, ttl=120)
 def fetch_recent_videos(_yt, channel_id: str, n: int = 10) -> pd.DataFrame:
     pid = channel_upload_playlist_id(_yt, channel_id)
     vids, token = [], None
     while len(vids) < n and pid:
-        resp = _yt.playlistItems().list(
-            part="snippet,contentDetails",
-            playlistId=pid,
-            maxResults=50,
-            pageToken=token
-        ).execute()
+        page = min(50, n - len(vids))
+        resp = _execute_etag(
+            _yt.playlistItems().list(part="snippet,contentDetails", playlistId=pid, maxResults=page, pageToken=token),
+            ("playlistItems", pid, page, token),
+        )
         for it in resp.get("items", []):
             vids.append(
                 {
@@ -1434,29 +1554,43 @@ def fetch_recent_videos(_yt, channel_id: str, n: int = 10) -> pd.DataFrame:
             break
     return pd.DataFrame(vids)
 @st.cache_data(show_spinner=False, ttl=120)
-def fetch_video_stats(_yt, ids: list[str]) -> pd.DataFrame:
+def fetch_videos_full(_yt, ids: tuple[str, ...]) -> pd.DataFrame:
+    """Stats + snippet + duration for up to 50 ids per videos.list call (one round-trip for n<=50)."""
+    cols = ["video_id", "title", "description", "views", "likes", "comments", "duration_s"]
     if not ids:
-        return pd.DataFrame(columns=["video_id", "title", "views", "likes", "comments", "description"])
-    rows = []
-    for chunk in [ids[i: i + 50] for i in range(0, len(ids), 50)]:
-        resp = _yt.videos().list(part="statistics,snippet", id=",".join(chunk)).execute()
-        for it in resp.get("items", []):
-            s = it["statistics"]
-            sn = it["snippet"]
-            rows.append(
-                {
-                    "video_id": it["id"],
-                    "title": sn.get("title", ""),
-                    "description": sn.get("description", ""),
-                    "views": int(s.get("viewCount", 0)),
-                    "likes": int(s.get("likeCount", 0)) if "likeCount" in s else np.nan,
-                    "comments": int(s.get("commentCount", 0)) if "commentCount" in s else np.nan,
-                }
-            )
-    return pd.DataFrame(rows).sort_values("views", ascending=False)
-@st.cache_data(show_spinner=False, ttl=120)
+        return pd.DataFrame(columns=cols)
+    ids = list(ids)
+    items = []
+    for i in range(0, len(ids), 50):
+        chunk = ",".join(ids[i: i + 50])
+        resp = _execute_etag(_yt.videos().list(part="statistics,snippet,contentDetails", id=chunk), ("videos", chunk))
+        items.extend(resp.get("items", []))
+    if not items:
+        return pd.DataFrame(columns=cols)
+    # One flatten + column-wise casts instead of per-item dicts and int() calls
+    raw = pd.json_normalize(items)
+    def _col(name: str, default):
+        return raw[name].fillna(default) if name in raw.columns else pd.Series(default, index=raw.index)
+    def _count(name: str) -> pd.Series:
+        return pd.to_numeric(_col(name, 0), errors="coerce").fillna(0).astype(np.int64)
+    df = pd.DataFrame(
+        {
+            "video_id": raw["id"],
+            "title": _col("snippet.title", ""),
+            "description": _col("snippet.description", ""),
+            "views": _count("statistics.viewCount"),
+            "likes": _count("statistics.likeCount"),
+            "comments": _count("statistics.commentCount"),
+            "duration_s": parse_durations_vec(_col("contentDetails.duration", "")),
+        },
+        columns=cols,
+    )
+    return df.sort_values("views", ascending=False)
+@st.cache_data(show_spinner=False, ttl=600)
 def fetch_channel_meta(_yt, channel_id: str) -> dict:
-    resp = _yt.channels().list(part="snippet,statistics", id=channel_id).execute()
+    resp = _execute_etag(
+        _yt.channels().list(part="snippet,statistics,contentDetails", id=channel_id), ("channels", channel_id)
+    )
     items = resp.get("items", [])
     if not items:
         return {}
@@ -1467,43 +1601,106 @@ def fetch_channel_meta(_yt, channel_id: str) -> dict:
         "subscribers": int(stt.get("subscriberCount", "0") or 0),
         "total_views": int(stt.get("viewCount", "0") or 0),
         "date": datetime.utcnow().strftime("%Y-%m-%d"),
+        "uploads_playlist": items[0].get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads"),
     }
-def yta_reports(session: AuthorizedSession, params: dict) -> dict:
+def yta_reports(session: AuthorizedSession | _Http2AnalyticsSession, params: dict) -> dict:
     url = "https://youtubeanalytics.googleapis.com/v2/reports"
     r = session.get(url, params=params, timeout=60)
     r.raise_for_status()
     return r.json()
+# Process-wide cap on concurrent YouTube Data API fan-out (all sessions share this)
+_YT_API_SEM = threading.Semaphore(4)
+# The script module re-executes on every rerun, so the pool and its thread-locals live in
+# cache_resource: worker threads persist across clicks and each keeps the service it built.
+@st.cache_resource
+def _audit_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="yt-audit")
+@st.cache_resource
+def _yt_thread_local() -> threading.local:
+    return threading.local()
+def _thread_yt_service():
+    # httplib2 (googleapiclient's transport) is not thread-safe: one service per worker thread
+    local = _yt_thread_local()
+    svc = getattr(local, "yt", None)
+    if svc is None:
+        svc = local.yt = build("youtube", "v3", developerKey=YOUTUBE_API_KEY, cache_discovery=False)
+    return svc
+def audit_one(channel_text: str, n: int) -> tuple[str | None, pd.DataFrame | None]:
+    """resolve → uploads playlist for one channel. Safe to call from a worker thread."""
+    with _YT_API_SEM:
+        yt = _thread_yt_service()
+        cid = resolve_channel_id(yt, channel_text) or parse_channel_or_id(channel_text)
+        if not cid:
+            return None, None
+        up = fetch_recent_videos(yt, cid, n)
+        if up.empty:
+            return None, None
+        return cid, up
+def audit_many(channel_texts: list[str], n: int) -> list[tuple]:
+    """audit_one for several channels, then one batched videos.list for all of their ids. Keeps input order."""
+    if not channel_texts:
+        return []
+    # Workers call cache_data functions; hand them this run's ScriptRunContext so Streamlit sees the session
+    ctx = get_script_run_ctx()
+    _yt_thread_local()  # resolve the cache_resource on the script thread
+    def _run(text: str):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return audit_one(text, n)
+    found = list(_audit_executor().map(_run, channel_texts))
+    all_ids = tuple(dict.fromkeys(v for _, up in found if up is not None for v in up["video_id"]))
+    all_stats = fetch_videos_full(yt_key_service(), all_ids)
+    return [
+        (cid, up, all_stats[all_stats["video_id"].isin(up["video_id"])]) if cid else (None, None, None)
+        for cid, up in found
+    ]
 # ---------------------------------------------------------------------
-# Analysis helpers (UNCHANGED)
+# Analysis helpers
 # ---------------------------------------------------------------------
-def engagement_rates(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["like_rate_%"] = (out["likes"] / out["views"].replace(0, np.nan) * 100).round(2)
-    out["comment_rate_%"] = (out["comments"] / out["views"].replace(0, np.nan) * 100).round(2)
-    return out
-def view_velocity(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["published_dt"] = pd.to_datetime(out["published"], utc=True, errors="coerce")
+# Compiled once; these run per title/description on every audit
+_WORD_RE = re.compile(r"[A-Za-z']{3,}")
+_LINK_RE = re.compile(r"https?://")
+_CHAP_RE = re.compile(r"\b\d{1,2}:\d{2}\b")
+_DIGIT_RE = re.compile(r"\d")
+# Video Ideas text cleanup (compiled once, used inside the generation loops)
+_NON_TOKEN_RE = re.compile(r"[^a-z0-9\s']")
+_TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
+_HASHTAG_RE = re.compile(r"#\w+")
+_DISPLAY_JUNK_RE = re.compile(r"[^\w\s£$€:,'’\-–—\.\?\!\(\)]")
+_SEED_JUNK_RE = re.compile(r"[^A-Za-z0-9\s\-']")
+_WS_RE = re.compile(r"\s+")
+_MULTI_WS_RE = re.compile(r"\s{2,}")
+_STOPWORDS = frozenset(
+    "the a an and or for with your this that what why how into from to of on in out are was were been being you my our their his her more most very".split()
+)
+def compute_audit_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """published_dt, age_min, views_per_min, like_rate_% and comment_rate_% in one pass over the arrays."""
     now = datetime.now(timezone.utc)
-    out["age_min"] = (now - out["published_dt"]).dt.total_seconds() / 60
-    out["views_per_min"] = (out["views"] / out["age_min"].clip(lower=1)).round(2)
-    return out
+    published_dt = pd.to_datetime(df["published"], utc=True, errors="coerce")
+    age_min = (now - published_dt).dt.total_seconds().to_numpy(dtype=np.float64) / 60
+    views = df["views"].to_numpy(dtype=np.float64)
+    denom = np.where(views == 0, np.nan, views)
+    # assign() returns a new frame sharing the existing column blocks (no full copy)
+    return df.assign(**{
+        "published_dt": published_dt,
+        "age_min": age_min,
+        "views_per_min": np.round(views / np.maximum(age_min, 1), 2),
+        "like_rate_%": np.round(df["likes"].to_numpy(dtype=np.float64) / denom * 100, 2),
+        "comment_rate_%": np.round(df["comments"].to_numpy(dtype=np.float64) / denom * 100, 2),
+    })
+def _dup_pen(words: list[str]) -> int:
+    if not words:
+        return 0
+    return max(Counter(words).most_common(1)[0][1] - 2, 0)
 def title_diagnostics(df: pd.DataFrame) -> pd.DataFrame:
-    t = df["title"].fillna("")
+    t = df["title"]
     out = pd.DataFrame(index=df.index)
     out["title_len"] = t.str.len()
     out["title_ok_len"] = out["title_len"].between(45, 70, inclusive="both")
-    def _dup_pen(s: str) -> int:
-        words = re.findall(r"[a-z']{3,}", s.lower())
-        if not words:
-            return 0
-        vc = pd.Series(words).value_counts()
-        peak = int(vc.iloc[0]) if not vc.empty else 0
-        return max(peak - 2, 0)
-    out["dup_word_penalty"] = t.apply(_dup_pen)
+    out["dup_word_penalty"] = t.str.lower().str.findall(_WORD_RE).map(_dup_pen).astype(int)
     return out
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 def cadence_stats(df: pd.DataFrame):
-    d = pd.to_datetime(df["published"], utc=True, errors="coerce").sort_values().dropna()
+    d = pd.to_datetime(df["published"], utc=True, errors="coerce").dropna().sort_values()
     if d.empty:
         return {
             "uploads_week": 0.0,
@@ -1512,87 +1709,142 @@ def cadence_stats(df: pd.DataFrame):
             "best_hour_utc": "N/A",
             "consistency_100": 0,
         }
-    gaps = d.diff().dt.total_seconds() / 86400
-    uploads_week = round(7.0 / gaps.median(), 2) if gaps.notna().any() else 0.0
-    day = d.dt.day_name().mode().iloc[0]
-    hour = int(d.dt.hour.mode().iloc[0])
+    ts = (d - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy()
+    gaps = np.diff(ts) / 86400.0
+    med_gap = float(np.median(gaps)) if gaps.size else np.nan
+    uploads_week = round(7.0 / np.float64(med_gap), 2) if gaps.size else 0.0
+    day = _DAY_NAMES[int(np.argmax(np.bincount(d.dt.dayofweek.to_numpy(), minlength=7)))]
+    hour = int(np.argmax(np.bincount(d.dt.hour.to_numpy(), minlength=24)))
     freq = min(1.0, uploads_week / 3.0)
-    var = gaps.std() if gaps.notna().sum() >= 2 else 5.0
+    var = float(np.std(gaps, ddof=1)) if gaps.size >= 2 else 5.0
     cons = int((0.7 * freq + 0.3 * (1 / (1 + var))) * 100)
     return {
         "uploads_week": uploads_week,
-        "median_gap_days": round(gaps.median(), 2),
+        "median_gap_days": round(med_gap, 2),
         "best_day": day,
         "best_hour_utc": hour,
         "consistency_100": cons,
     }
 def keyword_density(titles: list[str]) -> pd.Series:
-    words = []
-    for t in titles:
-        words += re.findall(r"[A-Za-z']{3,}", (t or "").lower())
-    stop = set(
-        "the a an and or for with your this that what why how into from to of on in out are was were been being you my our their his her more most very".split()
-    )
-    words = [w for w in words if w not in stop]
+    text = " ".join(t for t in titles if isinstance(t, str)).lower()
+    words = [w for w in _WORD_RE.findall(text) if w not in _STOPWORDS]
     if not words:
         return pd.Series(dtype=int)
-    return pd.Series(words).value_counts()
-_POWER = re.compile(r"\b(best|secret|fast|simple|ultimate|new|proof|free|easy|guide|mistake|hack|win|earn|rich|money|truth|behind|strategy|blueprint)\b", re.I)
+    return pd.Series(dict(Counter(words).most_common()))
+_POWER = re.compile(r"\b(?:best|secret|fast|simple|ultimate|new|proof|free|easy|guide|mistake|hack|win|earn|rich|money|truth|behind|strategy|blueprint)\b", re.I)
 def _has_number(s: str) -> bool:
-    return any(ch.isdigit() for ch in (s or ""))
+    return bool(_DIGIT_RE.search(s or ""))
 def _has_link(s: str) -> bool:
-    return bool(re.search(r"https?://", (s or "")))
+    return bool(_LINK_RE.search(s or ""))
 def _has_chapters(s: str) -> bool:
-    return bool(re.search(r"\b\d{1,2}:\d{2}\b", (s or "")))
-def seo_score_row(title: str, desc: str, like_rate: float, comment_rate: float, dup_penalty: int) -> tuple[int, dict]:
-    title = title or ""
-    desc = desc or ""
-    pts = 0
-    notes: dict[str, object] = {}
-    ok_len = 45 <= len(title) <= 70
-    pw = bool(_POWER.search(title))
-    num = _has_number(title)
-    if ok_len:
-        pts += 12
-    if pw:
-        pts += 10
-    if num:
-        pts += 8
-    if dup_penalty == 0:
-        pts += 10
-    notes.update({"title_len_ok": ok_len, "power_word": pw, "has_number": num, "dup_penalty": dup_penalty})
-    long_desc = len(desc) >= 200
-    chapters = _has_chapters(desc)
-    links = _has_link(desc)
-    if long_desc:
-        pts += 15
-    if chapters:
-        pts += 10
-    if links:
-        pts += 10
-    notes.update({"desc_len_ok": long_desc, "chapters": chapters, "links": links})
-    lr = max(0.0, float(like_rate or 0.0))
-    cr = max(0.0, float(comment_rate or 0.0))
-    pts += int(min(lr, 5.0) / 5.0 * 18)
-    pts += int(min(cr, 1.0) / 1.0 * 7)
-    notes.update({"like_rate_%": lr, "comment_rate_%": cr})
-    return int(min(100, pts)), notes
+    return bool(_CHAP_RE.search(s or ""))
+# seo_notes flag -> label used in the PDF "SEO SCORING SUMMARY" counts
+_SEO_SUMMARY_FLAGS = {
+    "has_number": "Missing number in title",
+    "power_word": "No power word",
+    "title_len_ok": "Title length off",
+    "chapters": "No chapters",
+    "links": "No link/CTA",
+    "desc_len_ok": "Short description",
+}
+def seo_scores_vec(df: pd.DataFrame) -> tuple[np.ndarray, pd.DataFrame]:
+    """SEO points for all rows at once; title/description must already be str. Returns (scores, notes_df)."""
+    title = df["title"]
+    desc = df["description"]
+    ok_len = title.str.len().between(45, 70)
+    pw = title.str.contains(_POWER)
+    num = title.str.contains(_DIGIT_RE)
+    dup = df["dup_word_penalty"].fillna(0).astype(int)
+    long_desc = desc.str.len() >= 200
+    chapters = desc.str.contains(_CHAP_RE)
+    links = desc.str.contains(_LINK_RE)
+    lr = df["like_rate_%"].fillna(0.0).clip(lower=0.0).to_numpy(dtype=np.float64)
+    cr = df["comment_rate_%"].fillna(0.0).clip(lower=0.0).to_numpy(dtype=np.float64)
+    pts = (
+        ok_len.to_numpy(dtype=np.int32) * 12
+        + pw.to_numpy(dtype=np.int32) * 10
+        + num.to_numpy(dtype=np.int32) * 8
+        + (dup == 0).to_numpy(dtype=np.int32) * 10
+        + long_desc.to_numpy(dtype=np.int32) * 15
+        + chapters.to_numpy(dtype=np.int32) * 10
+        + links.to_numpy(dtype=np.int32) * 10
+        + (np.minimum(lr, 5.0) / 5.0 * 18).astype(np.int32)
+        + (np.minimum(cr, 1.0) / 1.0 * 7).astype(np.int32)
+    )
+    notes_df = pd.DataFrame(
+        {
+            "title_len_ok": ok_len,
+            "power_word": pw,
+            "has_number": num,
+            "dup_penalty": dup,
+            "desc_len_ok": long_desc,
+            "chapters": chapters,
+            "links": links,
+            "like_rate_%": lr,
+            "comment_rate_%": cr,
+        },
+        index=df.index,
+    )
+    return np.minimum(pts, 100), notes_df
+# Key on the ids *and* the inputs that feed the scores, so refreshed stats or edited titles rescore
+_SCORE_KEY_COLS = ["video_id", "views", "likes", "comments", "published", "title", "description"]
+def _score_key(d: pd.DataFrame) -> tuple:
+    return len(d), int(pd.util.hash_pandas_object(d[_SCORE_KEY_COLS], index=False).sum())
+@st.cache_data(show_spinner=False, max_entries=256, hash_funcs={pd.DataFrame: _score_key})
+def score_audit_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds seo_score/seo_notes, vpm_z and health_100. Identical ids + stats + text hit the cache."""
+    df = df.copy()
+    scores, notes_df = seo_scores_vec(df)
+    df["seo_score"] = scores
+    df["seo_notes"] = notes_df.to_dict(orient="records")
+    x = df["views_per_min"].to_numpy(dtype=np.float64)
+    std = np.nanstd(x) if np.isfinite(x).any() else np.nan
+    if std == 0 or np.isnan(std):
+        df["vpm_z"] = np.zeros_like(x)
+    else:
+        df["vpm_z"] = np.nan_to_num((x - np.nanmean(x)) / std, nan=0.0, posinf=0.0, neginf=0.0)
+    vz = df["vpm_z"].to_numpy(dtype=np.float64)
+    lr = df["like_rate_%"].fillna(0).to_numpy(dtype=np.float64)
+    dp = df["dup_word_penalty"].to_numpy(dtype=np.float64)
+    tok = df["title_ok_len"].to_numpy(dtype=np.int8)
+    h = (np.clip(vz, -2, 3) + 2) / 5 * 60 + np.clip(lr, 0, 5) * 4 - np.clip(dp, 0, 3) * 3 + tok * 5
+    df["health_100"] = np.clip(np.round(h, 1), 0, 100)
+    return df
 # ---------------------------------------------------------------------
-# PDF helpers (UNCHANGED)
+# PDF helpers
 # ---------------------------------------------------------------------
 def _wrap(text: str, width_chars: int) -> list[str]:
-    text = (text or "").replace("\n", " ")
-    if not text:
+    return wrap(text or "", width=width_chars, break_long_words=True, replace_whitespace=True) or [""]
+def _wrap_px(text: str, max_width: float, font: str = "Helvetica", size: int = 9) -> list[str]:
+    """Greedy word wrap by measured glyph width (pdfmetrics.stringWidth), not character count."""
+    from reportlab.pdfbase import pdfmetrics
+    words = (text or "").split()
+    if not words:
         return [""]
-    words, line, out = text.split(), "", []
+    space = pdfmetrics.stringWidth(" ", font, size)
+    out, line, line_w = [], [], 0.0
     for w in words:
-        if len(line) + len(w) + (1 if line else 0) <= width_chars:
-            line = (line + " " + w).strip()
+        ww = pdfmetrics.stringWidth(w, font, size)
+        if ww > max_width:
+            # break_long_words: split an oversized token (long URL etc.) by measured width
+            if line:
+                out.append(" ".join(line))
+            chunk, chunk_w = "", 0.0
+            for ch in w:
+                cw = pdfmetrics.stringWidth(ch, font, size)
+                if chunk and chunk_w + cw > max_width:
+                    out.append(chunk)
+                    chunk, chunk_w = "", 0.0
+                chunk += ch
+                chunk_w += cw
+            line, line_w = [chunk], chunk_w
+        elif line and line_w + space + ww > max_width:
+            out.append(" ".join(line))
+            line, line_w = [w], ww
         else:
-            out.append(line)
-            line = w
-    if line:
-        out.append(line)
+            line_w += (space if line else 0.0) + ww
+            line.append(w)
+    out.append(" ".join(line))
     return out
 def improvements_for_video(v: dict, median_views: int) -> list[str]:
     tips = []
@@ -1644,10 +1896,13 @@ def quick_wins(videos: list[dict]) -> list[str]:
         "Pin a comment and reply to early comments within 1 hour.",
         "Batch-create 3 thumbnail variants and A/B test the strongest hook.",
     ]
-def build_elite_pdf(channel: dict, videos: list[dict], kpis: dict, insights: list[str], keywords: list[str]) -> bytes:
+def build_elite_pdf(stream, channel: dict, videos: list[dict], kpis: dict, insights: list[str], keywords: list[str]):
+    """Render the Elite PDF straight into a writable binary stream (path or file-like). Returns stream."""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
     W, H = A4
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
+    c = canvas.Canvas(stream, pagesize=A4)
+    c.setPageCompression(1)
     def draw_line(x, y, txt, font="Helvetica", size=10):
         c.setFont(font, size)
         c.drawString(x, y, txt)
@@ -1657,6 +1912,26 @@ def build_elite_pdf(channel: dict, videos: list[dict], kpis: dict, insights: lis
     COLS = ["TITLE", "DESCRIPTION", "COMMENTS", "VIEWS", "SEO /100"]
     CW = [220, 210, 70, 70, 60]
     X0, ROWH = 40, 12
+    HEADER = list(zip(COLS, CW))
+    def draw_header(y):
+        c.setFont("Helvetica-Bold", 10)
+        x = X0
+        for h, w in HEADER:
+            c.drawString(x + 2, y, h)
+            x += w
+        c.setFont("Helvetica", 9)
+        return y - ROWH
+    def section(y, title):
+        draw_line(X0, y, title, "Helvetica-Bold", 12)
+        return y - 14
+    def bullets(y, items, indent=10):
+        for item in items:
+            for chunk in _wrap(f"• {item}", 95):
+                draw_line(X0 + indent, y, chunk)
+                y -= ROWH
+                if y < 60:
+                    y = new_page()
+        return y
     y = H - 40
     draw_line(X0, y, f"YOUTUBE AUDIT TOOL — {channel.get('name', '')}", "Helvetica-Bold", 16)
     y -= 22
@@ -1664,24 +1939,19 @@ def build_elite_pdf(channel: dict, videos: list[dict], kpis: dict, insights: lis
     y -= 14
     draw_line(X0, y, f"Subs: {channel.get('subscribers', 0):,}   Total views: {channel.get('total_views', 0):,}")
     y -= 18
-    draw_line(X0, y, "KPI SUMMARY", "Helvetica-Bold", 12)
-    y -= 14
+    y = section(y, "KPI SUMMARY")
     for k, v in kpis.items():
         if k == "SEO_SUMMARY_LINES":
             continue
         draw_line(X0 + 10, y, f"- {k}: {v}")
         y -= ROWH
-    y -= 6
-    c.setFont("Helvetica-Bold", 10)
-    x = X0
-    for i, h in enumerate(COLS):
-        c.drawString(x + 2, y, h)
-        x += CW[i]
-    y -= ROWH
-    c.setFont("Helvetica", 9)
-    for v in videos:
-        title_lines = _wrap(v.get("title", ""), 36)
-        desc_lines = _wrap((v.get("description") or ""), 34)
+    y = draw_header(y - 6)
+    # Wrap every cell once up front, by real width of each column (minus 2pt padding each side)
+    wrapped = [
+        (_wrap_px(v.get("title", ""), CW[0] - 4), _wrap_px(v.get("description") or "", CW[1] - 4))
+        for v in videos
+    ]
+    for v, (title_lines, desc_lines) in zip(videos, wrapped):
         max_lines = max(len(title_lines), len(desc_lines))
         for i in range(max_lines):
             x = X0
@@ -1697,67 +1967,53 @@ def build_elite_pdf(channel: dict, videos: list[dict], kpis: dict, insights: lis
                 c.drawRightString(x + CW[4] - 4, y, f"{int(v.get('seo_score') or 0)}")
             y -= ROWH
             if y < 80:
-                y = new_page()
-                c.setFont("Helvetica-Bold", 10)
-                x = X0
-                for i, h in enumerate(COLS):
-                    c.drawString(x + 2, y, h)
-                    x += CW[i]
-                y -= ROWH
-                c.setFont("Helvetica", 9)
+                y = draw_header(new_page())
         y -= 4
         if y < 80:
             y = new_page()
-    draw_line(X0, y, "SEO SCORING SUMMARY", "Helvetica-Bold", 12)
-    y -= 14
+    y = section(y, "SEO SCORING SUMMARY")
     draw_line(X0 + 10, y, f"Average SEO score: {kpis.get('Avg SEO', '0/100')}")
-    y -= ROWH
-    for line_txt in kpis.get("SEO_SUMMARY_LINES", []):
-        for chunk in _wrap(f"• {line_txt}", 95):
-            draw_line(X0 + 10, y, chunk)
-            y -= ROWH
-            if y < 60:
-                y = new_page()
-    y -= 8
-    draw_line(X0, y, "SPECIFIC IMPROVEMENTS", "Helvetica-Bold", 12)
-    y -= 14
+    y = bullets(y - ROWH, kpis.get("SEO_SUMMARY_LINES", []))
+    y = section(y - 8, "SPECIFIC IMPROVEMENTS")
     med_views = int(pd.Series([int(v.get("views") or 0) for v in videos]).median()) if videos else 0
     for idx, v in enumerate(videos, start=1):
         tips = improvements_for_video(v, med_views)
         draw_line(X0, y, f"VID {idx}:", "Helvetica-Bold", 10)
-        y -= ROWH
-        for t in tips[:4]:
-            for chunk in _wrap(f"• {t}", 95):
-                draw_line(X0 + 10, y, chunk)
-                y -= ROWH
-                if y < 60:
-                    y = new_page()
+        y = bullets(y - ROWH, tips[:4])
         y -= 6
         if y < 60:
             y = new_page()
-    draw_line(X0, y, "IMPROVEMENT SUMMARY:", "Helvetica-Bold", 12)
-    y -= 14
-    for s in global_summary(videos)[:5]:
-        for chunk in _wrap(f"• {s}", 95):
-            draw_line(X0 + 10, y, chunk)
-            y -= ROWH
-            if y < 60:
-                y = new_page()
-    y -= 6
-    draw_line(X0, y, "VIDEO WINS:", "Helvetica-Bold", 12)
-    y -= 14
-    for w in quick_wins(videos)[:5]:
-        for chunk in _wrap(f"• {w}", 95):
-            draw_line(X0 + 10, y, chunk)
-            y -= ROWH
-            if y < 60:
-                y = new_page()
+    y = section(y, "IMPROVEMENT SUMMARY:")
+    y = bullets(y, global_summary(videos)[:5])
+    y = section(y - 6, "VIDEO WINS:")
+    bullets(y, quick_wins(videos)[:5])
     c.showPage()
     c.save()
-    buf.seek(0)
-    return buf.read()
+    return stream
+# Bump when scoring/tips change so cached PDFs from older code are not served
+SCORING_VERSION = "v3"
+_PDF_VIDEO_FIELDS = ("title", "description", "views", "likes", "comments", "seo_score")
+def _freeze(v):
+    return tuple(v) if isinstance(v, list) else v
+# ttl bounds how stale the "Generated: ... UTC" line baked into the cached bytes can get
+@st.cache_data(show_spinner=False, max_entries=8, ttl=600)
+def elite_pdf_bytes(channel_id: str, video_rows: tuple, channel: tuple, kpis: tuple, insights: tuple, keywords: tuple, scoring_version: str) -> bytes:
+    """Rendered Elite PDF, cached on hashable inputs (see pdf_cache_args) and scoring_version."""
+    buf = io.BytesIO()
+    videos = [dict(zip(_PDF_VIDEO_FIELDS, r)) for r in video_rows]
+    build_elite_pdf(buf, dict(channel), videos, dict(kpis), list(insights), list(keywords))
+    return buf.getvalue()
+def pdf_cache_args(channel: dict, videos: list[dict], kpis: dict, insights: list[str], keywords: list[str]):
+    rows = tuple(tuple(v.get(f) for f in _PDF_VIDEO_FIELDS) for v in videos)
+    return (
+        rows,
+        tuple(sorted(channel.items())),
+        tuple((k, _freeze(v)) for k, v in kpis.items()),
+        tuple(insights),
+        tuple(keywords),
+    )
 # ---------------------------------------------------------------------
-# Audience retention helpers (UNCHANGED)
+# Audience retention helpers
 # ---------------------------------------------------------------------
 def extract_video_id(s: str) -> str:
     s = (s or "").strip()
@@ -1833,47 +2089,35 @@ def _retention_fix_suggestion(t_sec, focus_window: str) -> str:
     if focus_window == "Full video":
         return "Add pattern-breaks every 30–45s: quick proof, b-roll swap, on-screen text, or a mini-reset of the goal."
     return "Shorten the section before this moment and reintroduce tension/curiosity right before the drop."
+_ISO_DUR = re.compile(r"(\d+)([DHMS])")
+_UNIT = {"D": 86400, "H": 3600, "M": 60, "S": 1}
 def parse_yt_duration_iso8601(d: str) -> int:
-    if not d or not d.startswith("PT"):
-        return 0
-    d = d[2:]
-    num = ""
-    total = 0
-    for ch in d:
-        if ch.isdigit():
-            num += ch
-        else:
-            if not num:
-                continue
-            val = int(num)
-            if ch == "H":
-                total += val * 3600
-            elif ch == "M":
-                total += val * 60
-            elif ch == "S":
-                total += val
-            num = ""
-    return total
+    return sum(int(n) * _UNIT[u] for n, u in _ISO_DUR.findall(d or ""))
+def parse_durations_vec(durations: pd.Series) -> pd.Series:
+    """parse_yt_duration_iso8601 over a whole Series (seconds, int64, same index)."""
+    parts = durations.fillna("").astype(str).str.extractall(_ISO_DUR)
+    if parts.empty:
+        return pd.Series(0, index=durations.index, dtype="int64")
+    secs = parts[0].astype(np.int64) * parts[1].map(_UNIT).astype(np.int64)
+    return secs.groupby(level=0).sum().reindex(durations.index, fill_value=0).astype("int64")
+# Tip buckets for top_drop_insights: t<=10s, <=30s, <=60s, later
+_DROP_TIP_EDGES = np.array([10, 30, 60])
+_DROP_TIPS = (
+    "open with a stronger hook, quick payoff in 0–10s",
+    "tighten intro, cut filler, show the outcome earlier",
+    "restate value, add motion/B-roll, remove a dead sentence",
+    "refresh pacing or add pattern-break (graphic, jump-cut, reveal)",
+)
 def top_drop_insights(df: pd.DataFrame, video_secs: int, k: int = 5) -> list[str]:
     if df.empty or video_secs <= 0:
         return []
     d = df.copy()
     d["drop"] = d["audienceWatchRatio"].diff().fillna(0.0)
     big = d.nsmallest(k, "drop")
-    out = []
-    for _, r in big.iterrows():
-        t = int(round(float(r["elapsedVideoTimeRatio"]) * video_secs))
-        pct = max(0.0, -float(r["drop"]) * 100.0)
-        if t <= 10:
-            tip = "open with a stronger hook, quick payoff in 0–10s"
-        elif t <= 30:
-            tip = "tighten intro, cut filler, show the outcome earlier"
-        elif t <= 60:
-            tip = "restate value, add motion/B-roll, remove a dead sentence"
-        else:
-            tip = "refresh pacing or add pattern-break (graphic, jump-cut, reveal)"
-        out.append(f"~{pct:.1f}% viewers dropped near {t}s → {tip}.")
-    return out
+    secs = np.round(big["elapsedVideoTimeRatio"].to_numpy(dtype=np.float64) * video_secs).astype(int)
+    pcts = np.maximum(0.0, -big["drop"].to_numpy(dtype=np.float64) * 100.0) + 0.0  # + 0.0 turns -0.0 into 0.0
+    idx = np.searchsorted(_DROP_TIP_EDGES, secs, side="left")
+    return [f"~{p:.1f}% viewers dropped near {t}s → {_DROP_TIPS[i]}." for p, t, i in zip(pcts, secs, idx)]
 def _retention_scorecard(df: pd.DataFrame, total_secs: int) -> dict:
     """Agency-friendly retention interpretation.
     Returns a dict with score (0-100), key metrics, and ranked issues (highest impact first).
@@ -1881,8 +2125,8 @@ def _retention_scorecard(df: pd.DataFrame, total_secs: int) -> dict:
     if df.empty:
         return {"score": 0, "metrics": {}, "issues": [], "wins": []}
     d = df.copy()
-    d["t_ratio"] = d["elapsedVideoTimeRatio"].astype(float).clip(0, 1)
-    d["watch"] = d["audienceWatchRatio"].astype(float).clip(lower=0)
+    d["t_ratio"] = np.clip(d["elapsedVideoTimeRatio"].to_numpy(dtype=np.float64), 0, 1)
+    d["watch"] = np.maximum(d["audienceWatchRatio"].to_numpy(dtype=np.float64), 0)
     d = d.sort_values("t_ratio")
     # Helper: watch ratio at a given second mark (nearest)
     def at_sec(sec: int) -> float:
@@ -1995,22 +2239,21 @@ def _retention_scorecard(df: pd.DataFrame, total_secs: int) -> dict:
     # Sort by rank
     issues = sorted(issues, key=lambda x: x["rank"])
     return {"score": score, "metrics": metrics, "issues": issues, "wins": wins}
-def _plot_retention(ax, df: pd.DataFrame, total_secs: int, focus_secs: int | None = None):
-    d = df.copy()
-    d["t_ratio"] = d["elapsedVideoTimeRatio"].astype(float).clip(0, 1)
-    d["watch"] = d["audienceWatchRatio"].astype(float).clip(lower=0)
-    d = d.sort_values("t_ratio")
-    if focus_secs and total_secs > 0:
-        r = max(0.0, min(1.0, focus_secs / float(total_secs)))
-        d = d[d["t_ratio"] <= r]
-    ax.plot(d["t_ratio"], d["watch"], linewidth=2)
-    ax.set_title("Retention curve" + (f" (first {focus_secs}s)" if focus_secs else ""))
-    ax.set_xlabel("Video progress (0–1)")
-    ax.set_ylabel("Audience watch ratio")
-    ax.grid(alpha=0.2)
 # ---------------------------------------------------------------------
 # UI
 # ---------------------------------------------------------------------
+# Audit results are materialised per (channel, n) in session_state under "audit:" keys
+if st.sidebar.button("Invalidate cache"):
+    for _k in [k for k in st.session_state.keys() if str(k).startswith("audit:")]:
+        del st.session_state[_k]
+    # The fetch/score caches are process-wide, so only the owner may drop them for everyone
+    if st.session_state.get("owner_mode", False):
+        fetch_recent_videos.clear()
+        fetch_videos_full.clear()
+        score_audit_df.clear()
+        st.sidebar.success("Audit cache cleared (all sessions).")
+    else:
+        st.sidebar.success("Audit cache cleared.")
 st.markdown(
     f"""
     <div class="yt-hero">
@@ -2028,7 +2271,7 @@ st.markdown(
 )
 tabs = st.tabs(["🔍 Growth Audit", "⚔ Competitors", "📈 Retention + Transcript", "🖼 Thumbnails", "💡 Video Ideas"])
 # ================================================================
-# Audit tab (UNCHANGED logic, demo cap kept)
+# Audit tab (demo cap kept)
 # ================================================================
 with tabs[0]:
     st.markdown('<div class="yt-section-card">', unsafe_allow_html=True)
@@ -2068,49 +2311,30 @@ with tabs[0]:
         if not ch_id:
             st.error("Could not resolve channel.")
             st.stop()
-        uploads = fetch_recent_videos(yt, ch_id, recent_n)
-        stats = fetch_video_stats(yt, uploads["video_id"].tolist())
-        df = stats.merge(
-            uploads[["video_id", "published", "title"]],
-            on="video_id",
-            how="left",
-            suffixes=("", "_upl"),
-        )
-        if "title_upl" in df.columns:
-            df["title"] = df["title"].fillna(df["title_upl"])
-            df.drop(columns=["title_upl"], inplace=True)
-        df = engagement_rates(view_velocity(df))
-        td = title_diagnostics(df)
-        df = pd.concat([df, td], axis=1)
-        seo_scores, seo_notes = [], []
-        for _, r in df.iterrows():
-            score, notes = seo_score_row(
-                title=str(r.get("title", "")),
-                desc=str(r.get("description", "")),
-                like_rate=float(r.get("like_rate_%") or 0.0),
-                comment_rate=float(r.get("comment_rate_%") or 0.0),
-                dup_penalty=int(r.get("dup_word_penalty") or 0),
+        audit_key = f"audit:{ch_id}:{int(recent_n)}"
+        if audit_key not in st.session_state:
+            uploads = fetch_recent_videos(yt, ch_id, recent_n)
+            stats = fetch_videos_full(yt, tuple(uploads["video_id"]))
+            df = (
+                stats.set_index("video_id")
+                .join(uploads.set_index("video_id")[["published", "title"]], how="left", rsuffix="_upl")
+                .reset_index()
             )
-            seo_scores.append(score)
-            seo_notes.append(notes)
-        df["seo_score"] = seo_scores
-        df["seo_notes"] = seo_notes
-        seo_avg = int(np.nanmean(seo_scores)) if seo_scores else 0
-        std = df["views_per_min"].std(ddof=0)
-        if std == 0 or np.isnan(std):
-            df["vpm_z"] = 0
-        else:
-            z = (df["views_per_min"] - df["views_per_min"].mean()) / std
-            df["vpm_z"] = z.replace([np.inf, -np.inf], np.nan).fillna(0)
-        df["health_100"] = (
-            (df["vpm_z"].clip(-2, 3) + 2) / 5 * 60
-            + df["like_rate_%"].fillna(0).clip(0, 5) * 4
-            - df["dup_word_penalty"].clip(lower=0, upper=3) * 3
-            + df["title_ok_len"].astype(int) * 5
-        ).round(1).clip(0, 100)
+            if "title_upl" in df.columns:
+                df["title"] = df["title"].combine_first(df.pop("title_upl"))
+            # One vectorized cast here; title_diagnostics, seo_scores_vec and vids_list read them as-is
+            df[["title", "description"]] = df[["title", "description"]].fillna("").astype(str)
+            df = compute_audit_metrics(df)
+            # td is built on df.index, so plain per-column assignment (keeps each dtype, no concat/align)
+            for col, vals in title_diagnostics(df).items():
+                df[col] = vals.to_numpy()
+            st.session_state[audit_key] = score_audit_df(df)
+        df = st.session_state[audit_key]
+        seo_avg = int(np.nanmean(df["seo_score"])) if len(df) else 0
         vids = len(df)
-        avg_views = int(df["views"].mean()) if vids else 0
-        med_likes = int(df["likes"].median()) if df["likes"].notna().sum() and vids else 0
+        avg_views = int(np.nanmean(df["views"].to_numpy(dtype=np.float64))) if vids else 0
+        likes_arr = df["likes"].to_numpy(dtype=np.float64)
+        med_likes = 0 if np.isnan(likes_arr).all() else int(np.nanmedian(likes_arr))
         vpm_raw = df["views_per_min"].mean(skipna=True) if vids else 0
         vpm = int(vpm_raw) if pd.notna(vpm_raw) else 0
         cad = cadence_stats(df)
@@ -2151,19 +2375,15 @@ with tabs[0]:
             "date": datetime.utcnow().strftime("%Y-%m-%d"),
         }
         st.session_state["channel_info"] = ch_meta
-        vids_list = []
-        for _, r in df.iterrows():
-            vids_list.append(
-                {
-                    "title": str(r.get("title", "")),
-                    "description": str(r.get("description", "")),
-                    "comments": int(r.get("comments") or 0),
-                    "likes": int(r.get("likes") or 0),
-                    "views": int(r.get("views") or 0),
-                    "seo_score": int(r.get("seo_score") or 0),
-                    "upload_date": str(r.get("published", ""))[:10],
-                }
-            )
+        st.session_state["channel_id"] = ch_id
+        sub = df.assign(
+            comments=df["comments"].fillna(0).astype(int),
+            likes=df["likes"].fillna(0).astype(int),
+            views=df["views"].fillna(0).astype(int),
+            seo_score=df["seo_score"].fillna(0).astype(int),
+            upload_date=df["published"].astype(str).str.slice(0, 10),
+        )
+        vids_list = sub[["title", "description", "comments", "likes", "views", "seo_score", "upload_date"]].to_dict(orient="records")
         st.session_state["videos"] = vids_list
         kpis = {
             "Videos": str(vids),
@@ -2173,16 +2393,12 @@ with tabs[0]:
             "Consistency": f"{cad.get('consistency_100', 0)}/100",
             "Avg SEO": f"{seo_avg}/100",
         }
-        def _miss(flag):
-            return sum(1 for n in df["seo_notes"] if not n.get(flag, False))
-        seo_summary_counts = {
-            "Missing number in title": _miss("has_number"),
-            "No power word": _miss("power_word"),
-            "Title length off": _miss("title_len_ok"),
-            "No chapters": _miss("chapters"),
-            "No link/CTA": _miss("links"),
-            "Short description": _miss("desc_len_ok"),
-        }
+        notes = df["seo_notes"].tolist()
+        keys = tuple(_SEO_SUMMARY_FLAGS)
+        miss = np.fromiter(
+            (not n.get(k, False) for n in notes for k in keys), dtype=bool, count=len(notes) * len(keys)
+        ).reshape(-1, len(keys))
+        seo_summary_counts = dict(zip(_SEO_SUMMARY_FLAGS.values(), miss.sum(axis=0).tolist()))
         kpis["SEO_SUMMARY_LINES"] = [f"{k}: {v} videos" for k, v in seo_summary_counts.items()]
         st.session_state["kpis"] = kpis
         st.session_state["insights"] = insights
@@ -2194,12 +2410,16 @@ with tabs[0]:
             st.caption("Elite PDF is locked in demo. Enter a license key to unlock export.")
         else:
             if st.button("Generate Elite PDF"):
-                pdf_bytes = build_elite_pdf(
-                    ch,
-                    vv,
-                    st.session_state.get("kpis", {}),
-                    st.session_state.get("insights", []),
-                    st.session_state.get("top_keywords", []),
+                pdf_bytes = elite_pdf_bytes(
+                    st.session_state.get("channel_id", ""),
+                    *pdf_cache_args(
+                        ch,
+                        vv,
+                        st.session_state.get("kpis", {}),
+                        st.session_state.get("insights", []),
+                        st.session_state.get("top_keywords", []),
+                    ),
+                    scoring_version=SCORING_VERSION,
                 )
                 st.download_button(
                     "Download Elite PDF",
@@ -2251,26 +2471,20 @@ with tabs[1]:
         compB_input = st.text_input("Competitor B URL/ID", value="", key="comp_b")
         comp_n = st.slider("Recent videos per channel", 3, 40, 5, key="comp_n")
         if st.button("Run Comparison"):
-            yt = yt_key_service()
             rows = []
-            for who, inp in [("You", base_input), ("A", compA_input), ("B", compB_input)]:
-                if not inp.strip():
-                    continue
-                cid = resolve_channel_id(yt, inp) or parse_channel_or_id(inp)
+            jobs = [(who, inp) for who, inp in [("You", base_input), ("A", compA_input), ("B", compB_input)] if inp.strip()]
+            # Channels are fetched concurrently; merges below stay on the script thread
+            for (who, _), (cid, up, stt) in zip(jobs, audit_many([inp for _, inp in jobs], comp_n)):
                 if not cid:
                     continue
-                up = fetch_recent_videos(yt, cid, comp_n)
-                stt = fetch_video_stats(yt, up["video_id"].tolist())
-                merged = stt.merge(
-                    up[["video_id", "published", "title"]],
-                    on="video_id",
-                    how="left",
-                    suffixes=("", "_upl"),
+                merged = (
+                    stt.set_index("video_id")
+                    .join(up.set_index("video_id")[["published", "title"]], how="left", rsuffix="_upl")
+                    .reset_index()
                 )
                 if "title_upl" in merged.columns:
-                    merged["title"] = merged["title"].fillna(merged["title_upl"])
-                    merged.drop(columns=["title_upl"], inplace=True)
-                merged = engagement_rates(view_velocity(merged))
+                    merged["title"] = merged["title"].combine_first(merged.pop("title_upl"))
+                merged = compute_audit_metrics(merged)
                 merged.insert(0, "who", who)
                 rows.append(merged)
             if not rows:
@@ -2340,17 +2554,10 @@ with tabs[2]:
             if not vid:
                 st.error("Enter a valid video URL or ID.")
             else:
-                # Cache OAuth clients in-session to avoid re-auth overhead per rerun
+                # Both factories are cache_resource: one service + pooled session per process
                 try:
-                    if "yta_clients" not in st.session_state:
-                        st.session_state["yta_clients"] = {}
-                        st.session_state["yta_clients"]["yt_key"] = yt_key_service()
-                        yt_oauth, session = yt_oauth_clients()
-                        st.session_state["yta_clients"]["yt_oauth"] = yt_oauth
-                        st.session_state["yta_clients"]["session"] = session
-                    yt_key = st.session_state["yta_clients"]["yt_key"]
-                    yt_oauth = st.session_state["yta_clients"]["yt_oauth"]
-                    session = st.session_state["yta_clients"]["session"]
+                    yt_key = yt_key_service()
+                    yt_oauth, session = yt_oauth_clients()
                 except Exception as e:
                     st.error(f"Auth initialisation failed: {e}")
                     st.markdown("</div>", unsafe_allow_html=True)
@@ -2511,7 +2718,7 @@ with tabs[3]:
         )
         hint = st.text_input("Title hint", value="")
         if st.button("Generate 10 ideas"):
-            key = (re.findall(r"[A-Za-z']{3,}", hint.lower()) or ["Your Bot"])[0].title()
+            key = (_WORD_RE.findall(hint.lower()) or ["Your Bot"])[0].title()
             ideas = [
                 "Make £100/Day | Right split | You pointing | Blurred stats | Electric blue",
                 f"Fix {key} Fast | Left bar | You with wrench | Circuit board | Neon green",
@@ -2648,7 +2855,7 @@ with tabs[4]:
         }
         def _tok(s: str) -> list[str]:
             s = (s or "").lower()
-            s = re.sub(r"[^a-z0-9\s']", " ", s)
+            s = _NON_TOKEN_RE.sub(" ", s)
             parts = [p.strip("'") for p in s.split() if p.strip("'")]
             return [p for p in parts if p not in STOP and len(p) > 2 and not p.isdigit()]
         def _ngrams(tokens: list[str], n: int) -> list[str]:
@@ -2660,30 +2867,6 @@ with tabs[4]:
             age_days = age_days.clip(lower=1.0)
             d["views_per_day"] = (pd.to_numeric(d.get("views", 0), errors="coerce").fillna(0) / age_days)
             return d
-        def _parse_iso8601_duration(dur: str) -> int:
-            # PT#H#M#S
-            if not dur or not dur.startswith("PT"):
-                return 0
-            h = m = s = 0
-            m1 = re.search(r"(\d+)H", dur)
-            m2 = re.search(r"(\d+)M", dur)
-            m3 = re.search(r"(\d+)S", dur)
-            if m1: h = int(m1.group(1))
-            if m2: m = int(m2.group(1))
-            if m3: s = int(m3.group(1))
-            return h*3600 + m*60 + s
-        @st.cache_data(show_spinner=False, ttl=60*60)
-        def _fetch_durations(_yt, video_ids: list[str]) -> dict:
-            out = {}
-            # chunk 50
-            for i in range(0, len(video_ids), 50):
-                chunk = video_ids[i:i+50]
-                r = _yt.videos().list(part="contentDetails", id=",".join(chunk), maxResults=50).execute()
-                for it in r.get("items", []):
-                    vid = it.get("id")
-                    dur = it.get("contentDetails", {}).get("duration", "")
-                    out[vid] = _parse_iso8601_duration(dur)
-            return out
         def _fingerprint_terms(title_series: list[str], weight_series: list[float]) -> tuple[dict, set, set]:
             # weighted n-grams (2-3)
             w = {}
@@ -2807,9 +2990,9 @@ with tabs[4]:
             return p1, p2, p3
         def _clean_title_display(s: str) -> str:
             s = (s or "").strip()
-            s = re.sub(r"#\w+", "", s)
-            s = re.sub(r"[^\w\s£$€:,'’\-–—\.\?\!\(\)]", "", s)
-            s = re.sub(r"\s{2,}", " ", s).strip()
+            s = _HASHTAG_RE.sub("", s)
+            s = _DISPLAY_JUNK_RE.sub("", s)
+            s = _MULTI_WS_RE.sub(" ", s).strip()
             return s if len(s) <= 80 else (s[:77].rstrip() + "...")
         if st.button("Generate briefs", key="vi_go"):
             yt = yt_key_service()
@@ -2819,31 +3002,38 @@ with tabs[4]:
             else:
                 # Region mapping
                 region_code = {"UK": "GB", "US": "US", "Global": None}.get(region_label, None)
-                # Base corpus
-                base = fetch_recent_videos(yt, cid, 70)
-                base_stats = fetch_video_stats(yt, base["video_id"].tolist())
-                base = base.merge(base_stats, on="video_id", how="left")
-                base = _views_per_day(base)
-                # Optional competitor enrich
-                if comp_in.strip():
-                    ccid = resolve_channel_id(yt, comp_in) or parse_channel_or_id(comp_in)
+                ccid = (resolve_channel_id(yt, comp_in) or parse_channel_or_id(comp_in)) if comp_in.strip() else None
+                # Niche fingerprint per (channel, competitor): repeat runs within the fetch cache's 120s
+                # skip the corpus fetch + scoring. "audit:" prefix so the sidebar Invalidate cache clears it.
+                terms_key = f"audit:vi_terms:{cid}:{ccid or ''}"
+                cached_terms = st.session_state.get(terms_key)
+                if cached_terms and time.monotonic() - cached_terms[0] < 120:
+                    top_terms, uni, bi = cached_terms[1]
+                else:
+                    # Base corpus
+                    base = fetch_recent_videos(yt, cid, 70)
+                    base_stats = fetch_videos_full(yt, tuple(base["video_id"]))
+                    base = base.merge(base_stats, on="video_id", how="left")
+                    base = _views_per_day(base)
+                    # Optional competitor enrich
                     if ccid:
                         comp = fetch_recent_videos(yt, ccid, 50)
-                        comp_stats = fetch_video_stats(yt, comp["video_id"].tolist())
+                        comp_stats = fetch_videos_full(yt, tuple(comp["video_id"]))
                         comp = comp.merge(comp_stats, on="video_id", how="left")
                         comp = _views_per_day(comp)
                         base = pd.concat([base, comp], ignore_index=True)
-                # Ensure we have a usable title column after merges (avoid KeyError if pandas adds suffixes)
-                if "title" not in base.columns:
-                    for _c in ("title_x", "title_y", "video_title", "snippet_title", "name"):
-                        if _c in base.columns:
-                            base["title"] = base[_c]
-                            break
-                    else:
-                        base["title"] = ""
-                titles = base["title"].fillna("").astype(str).tolist()
-                weights = base["views_per_day"].fillna(0).astype(float).tolist()
-                top_terms, uni, bi = _fingerprint_terms(titles, weights)
+                    # Ensure we have a usable title column after merges (avoid KeyError if pandas adds suffixes)
+                    if "title" not in base.columns:
+                        for _c in ("title_x", "title_y", "video_title", "snippet_title", "name"):
+                            if _c in base.columns:
+                                base["title"] = base[_c]
+                                break
+                        else:
+                            base["title"] = ""
+                    titles = base["title"].fillna("").astype(str).tolist()
+                    weights = base["views_per_day"].fillna(0).astype(float).tolist()
+                    top_terms, uni, bi = _fingerprint_terms(titles, weights)
+                    st.session_state[terms_key] = (time.monotonic(), (top_terms, uni, bi))
                 queries = _pick_queries(top_terms)
                 # Pull trend candidates
                 cand = []
@@ -2882,10 +3072,9 @@ with tabs[4]:
                                 cand_df["seed"] = cand_df["query"]
                             else:
                                 cand_df["seed"] = ""
-                    stats = fetch_video_stats(yt, cand_df["video_id"].tolist())
+                    stats = fetch_videos_full(yt, tuple(cand_df["video_id"]))
                     cand_df = cand_df.merge(stats, on="video_id", how="left")
-                    durs = _fetch_durations(yt, cand_df["video_id"].tolist())
-                    cand_df["duration_s"] = cand_df["video_id"].map(lambda x: durs.get(x, 0))
+                    cand_df["duration_s"] = cand_df["duration_s"].fillna(0).astype(int)
                     cand_df = _views_per_day(cand_df)
                     # Hard filters
                     cand_df = _vi_normalize_df(cand_df)
@@ -2915,7 +3104,7 @@ with tabs[4]:
                                 parts = [p.strip() for p in raw.split(",")]
                                 out = []
                                 for p in parts:
-                                    p2 = re.sub(r"[^A-Za-z0-9\s\-']", "", p).strip()
+                                    p2 = _SEED_JUNK_RE.sub("", p).strip()
                                     if len(p2) >= 2:
                                         out.append(p2)
                                 # de-dup preserve order
@@ -2926,7 +3115,7 @@ with tabs[4]:
                                     seen.add(k); uniq.append(x)
                                 return uniq
                             def _prefix3(t: str) -> str:
-                                w = re.findall(r"[A-Za-z0-9']+", (t or "").lower())
+                                w = _TOKEN_RE.findall((t or "").lower())
                                 return " ".join(w[:3])
                             def _family(t: str) -> str:
                                 tl = (t or "").lower()
@@ -2990,7 +3179,7 @@ with tabs[4]:
                                     return out
                                 def _norm(s: str) -> str:
                                     s = (s or "").strip()
-                                    s = re.sub(r"\s+", " ", s)
+                                    s = _WS_RE.sub(" ", s)
                                     return s
                                 for raw in titles[:80]:
                                     t = _norm(raw)
@@ -3062,21 +3251,19 @@ with tabs[4]:
                                         seeds.append(t.strip())
                                 if df is not None and not df.empty and "seed" in df.columns:
                                     for s in df["seed"].fillna("").astype(str).tolist():
-                                        s2 = re.sub(r"[^A-Za-z0-9\s\-']", " ", s).strip()
-                                        s2 = re.sub(r"\s{2,}", " ", s2)
+                                        s2 = _SEED_JUNK_RE.sub(" ", s).strip()
+                                        s2 = _MULTI_WS_RE.sub(" ", s2)
                                         # avoid junky two-word fragments like 'reveals brutal'
                                         if len(s2) < 4:
                                             continue
                                         if any(x in s2.lower() for x in ["reveals", "brutal", "truth", "clips"]):
                                             continue
                                         seeds.append(s2)
-                                # de-dup preserve order
-                                seen=set(); out=[]
+                                # de-dup preserve order (first spelling of each lowercase key wins)
+                                out: dict[str, str] = {}
                                 for s in seeds:
-                                    k=s.lower()
-                                    if k in seen: continue
-                                    seen.add(k); out.append(s)
-                                return out
+                                    out.setdefault(s.lower(), s)
+                                return list(out.values())
                             seed_pool = _seed_pool(ev_for_frames)
                             if not seed_pool:
                                 seed_pool = ["Wealth", "Success", "Money", "Discipline", "Mindset"]
@@ -3087,7 +3274,7 @@ with tabs[4]:
                                 topic = (kw or seed).strip()
                                 t = t.replace("{SEED}", seed).replace("{MECH}", mech).replace("{TOPIC}", topic)
                                 # Clean weird doubles
-                                t = re.sub(r"\s{2,}", " ", t).strip()
+                                t = _MULTI_WS_RE.sub(" ", t).strip()
                                 return t
                             # Frame bank (non-spinner). Uses TOPIC + MECH and avoids repeating 'reveals/truth' constantly.
                             base_frames = [
@@ -3111,45 +3298,45 @@ with tabs[4]:
                                     all_frames.append(fr.strip())
                             for fr in base_frames:
                                 all_frames.append(fr)
-                            seen_fr=set(); uniq_frames=[]
+                            uniq_frames: dict[str, str] = {}
                             for fr in all_frames:
                                 k=fr.lower()
-                                if k in seen_fr: continue
                                 # drop bad generic mined frames
                                 if "what works right now" in k: continue
                                 if "fastest way to get results" in k: continue
-                                seen_fr.add(k); uniq_frames.append(fr)
-                            all_frames = uniq_frames
-                            ideas = []
-                            used = set()
+                                uniq_frames.setdefault(k, fr)
+                            all_frames = list(uniq_frames.values())
+                            # lowercase key -> title: one ordered dict does both dedup and ordering
+                            ideas: dict[str, str] = {}
                             prefix_counts = {}
                             family_counts = {}
                             per_seed_counts = {}
                             per_seed_cap = max(2, int(round(how_many * 0.30)))
-                            def _accept(title: str) -> bool:
+                            # _accept returns the (key, prefix, family) it computed so _record doesn't redo them
+                            def _accept(title: str):
                                 if not title:
-                                    return False
+                                    return None
                                 if _is_spam_title(title):
-                                    return False
+                                    return None
                                 k = title.lower().strip()
-                                if k in used:
-                                    return False
+                                if k in ideas:
+                                    return None
                                 p = _prefix3(title)
                                 if prefix_counts.get(p, 0) >= 2:
-                                    return False
+                                    return None
                                 fam = _family(title)
                                 if family_counts.get(fam, 0) >= 3:
-                                    return False
-                                return True
-                            def _record(title: str, seed_txt: str):
-                                used.add(title.lower().strip())
-                                prefix_counts[_prefix3(title)] = prefix_counts.get(_prefix3(title), 0) + 1
-                                fam = _family(title)
+                                    return None
+                                return k, p, fam
+                            def _record(title: str, seed_txt: str, meta: tuple):
+                                k, p, fam = meta
+                                prefix_counts[p] = prefix_counts.get(p, 0) + 1
                                 family_counts[fam] = family_counts.get(fam, 0) + 1
                                 per_seed_counts[seed_txt] = per_seed_counts.get(seed_txt, 0) + 1
-                                ideas.append(title)
+                                ideas[k] = title
                             # Generation pass 1: strict (must include keyword if provided)
                             kw_cycle = (kw_tokens or [None])
+                            kw_lower = [k.lower() for k in (kw_tokens or [])]
                             kw_i = 0
                             for seed_txt in seed_pool:
                                 if len(ideas) >= how_many:
@@ -3165,12 +3352,14 @@ with tabs[4]:
                                     kw_i += 1
                                     t = _clean_title_display(_render(fr, seed_txt, mech, style, kw))
                                     # if user provided keywords, enforce at least one appears in the title
-                                    if kw_tokens:
-                                        if not any(k.lower() in t.lower() for k in kw_tokens):
+                                    if kw_lower:
+                                        tl = t.lower()
+                                        if not any(k in tl for k in kw_lower):
                                             continue
-                                    if not _accept(t):
+                                    meta = _accept(t)
+                                    if meta is None:
                                         continue
-                                    _record(t, seed_txt)
+                                    _record(t, seed_txt, meta)
                             # Generation pass 2: backfill (allow titles that don't contain kw, but still niche-safe)
                             if len(ideas) < how_many:
                                 for seed_txt in seed_pool:
@@ -3183,10 +3372,11 @@ with tabs[4]:
                                             break
                                         mech = mechs[len(ideas) % len(mechs)]
                                         t = _clean_title_display(_render(fr, seed_txt, mech, style, None))
-                                        if not _accept(t):
+                                        meta = _accept(t)
+                                        if meta is None:
                                             continue
-                                        _record(t, seed_txt)
-                            ideas = ideas[:how_many]
+                                        _record(t, seed_txt, meta)
+                            ideas = list(ideas.values())[:how_many]
                             ideas_df = pd.DataFrame({"Primary title": ideas})
                             st.markdown("### Your titles")
                             if ideas_df is None or ideas_df.empty:
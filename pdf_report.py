@@ -1,62 +1,274 @@
 # pdf_report.py — YouTube Audit Pro v2 (Elite PDF, text-first)
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFError
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether, Flowable
+    BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak, KeepTogether, Flowable
 )
-from datetime import datetime
-from statistics import mean
+from reportlab.platypus.paraparser import ParaParser
+from reportlab.platypus.paragraph import cleanBlockQuotedText, textTransformFrags
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from xml.sax.saxutils import escape
+import io
 import math
+import numpy as np
 
-SUPPORTLY_BLUE = colors.HexColor("#27A6FF")
+# Unicode TTF (subset-embedded) registered once at import: DejaVu Sans when the system has it,
+# else the Vera faces that ship with ReportLab; Helvetica only if neither can be loaded.
+_TTF_FACES = (
+    ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans-Oblique.ttf", "DejaVuSans-BoldOblique.ttf"),
+    ("Vera.ttf", "VeraBd.ttf", "VeraIt.ttf", "VeraBI.ttf"),
+)
+
+def _register_ui_font():
+    names = ("UIFont", "UIFont-Bold", "UIFont-Oblique", "UIFont-BoldOblique")
+    for files in _TTF_FACES:
+        try:
+            faces = [TTFont(name, f) for name, f in zip(names, files)]
+        except (TTFError, OSError):
+            continue
+        for face in faces:
+            pdfmetrics.registerFont(face)
+        # so <b>/<i> inside Paragraph markup resolve to the TTF faces
+        for (bold, italic), name in zip(((0, 0), (1, 0), (0, 1), (1, 1)), names):
+            addMapping("UIFont", bold, italic, name)
+        return names[0], names[1], names[2]
+    return "Helvetica", "Helvetica-Bold", "Helvetica-Oblique"
+
+FONT, FONT_BOLD, FONT_OBLIQUE = _register_ui_font()
+
+_BLUE_HEX = "#27A6FF"  # also used inline in Paragraph markup
+SUPPORTLY_BLUE = colors.HexColor(_BLUE_HEX)
 NAVY_BG = colors.HexColor("#0B1C3D")
 PANEL_BG = colors.HexColor("#0E2452")
 TEXT = colors.white
 
+# Paragraph styles: only the five the report uses (no getSampleStyleSheet), shared by every PDF
+STYLES = {
+    "H1": ParagraphStyle(name="H1", fontName=FONT_BOLD, fontSize=14, textColor=SUPPORTLY_BLUE, spaceAfter=6),
+    "H2": ParagraphStyle(name="H2", fontName=FONT_BOLD, fontSize=11, textColor=SUPPORTLY_BLUE, spaceBefore=6, spaceAfter=4),
+    "Body": ParagraphStyle(name="Body", fontName=FONT, fontSize=9, textColor=colors.black, leading=12),
+    "Small": ParagraphStyle(name="Small", fontName=FONT, fontSize=8, textColor=colors.black, leading=11),
+    "Muted": ParagraphStyle(name="Muted", fontName=FONT_OBLIQUE, fontSize=8, textColor=colors.grey),
+}
+
+# Table styles: built once at import and shared by every PDF (setStyle copies the commands)
+_KPI_STYLE = TableStyle([
+    ("BOX", (0,0), (-1,-1), 0.5, colors.HexColor("#dddddd")),
+    ("INNERGRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f6f8ff")),
+    ("FONTNAME", (0,0), (-1,-1), FONT),
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+    ("TEXTCOLOR", (0,0), (0,-1), colors.HexColor("#333333")),
+])
+_VIDEO_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0,0), (-1,-1), FONT),
+    ("FONTSIZE", (0,0), (-1,-1), 8),
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eaf4ff")),
+    ("TEXTCOLOR", (0,0), (-1,0), colors.HexColor("#00395b")),
+    ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#cfd7e6")),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+])
+_INSIGHT_STYLE = TableStyle([
+    ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
+    ("BACKGROUND", (0,0), (-1,-1), colors.HexColor("#fafafa")),
+    ("FONTNAME", (0,0), (-1,-1), FONT),
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+])
+_KW_STYLE = TableStyle([
+    ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#cfd7e6")),
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eaf4ff")),
+    ("FONTNAME", (0,0), (-1,-1), FONT),
+    ("FONTSIZE", (0,0), (-1,-1), 8),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),
+])
+_AVG_STYLE = _INSIGHT_STYLE  # same two-column key/value look
+_SCORE_STYLE = TableStyle([
+    ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f6f8ff")),
+    ("FONTNAME", (0,0), (-1,-1), FONT),
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+])
+
 # ---------- helpers ----------
 def _safe(x, default="—"):
     return default if x is None or x == "" else x
 
+# Format helpers: numbers (the common case) skip float() and the exception path entirely
 def _pct(x, default="—"):
+    if isinstance(x, (int, float)):
+        return f"{x:.1f}%"
+    if x is None or x == "":
+        return default
     try:
         return f"{float(x):.1f}%"
-    except:
+    except (TypeError, ValueError):
         return default
 
 def _num(x, default="—"):
-    try:
-        if abs(float(x)) >= 1000:
-            return f"{float(x):,.0f}"
-        return f"{float(x):.0f}"
-    except:
-        return default
+    if not isinstance(x, (int, float)):
+        if x is None or x == "":
+            return default
+        try:
+            x = float(x)
+        except (TypeError, ValueError):
+            return default
+    return f"{x:,.0f}" if abs(x) >= 1000 else f"{x:.0f}"
 
 def _hrs(x, default="—"):
+    if isinstance(x, (int, float)):
+        return f"{x:.1f}"
+    if x is None or x == "":
+        return default
     try:
         return f"{float(x):.1f}"
-    except:
+    except (TypeError, ValueError):
         return default
 
-def _avg(seq):
-    seq = [float(x) for x in seq if isinstance(x,(int,float,str)) and str(x).strip() not in ("", "—", "nan", "None")]
-    return mean(seq) if seq else 0.0
+_TODAY = (0, "")  # (UTC day ordinal, "YYYY-MM-DD") so batch builds format the date once per day
+
+def _utc_today():
+    global _TODAY
+    now = datetime.now(timezone.utc)
+    day = now.toordinal()
+    if _TODAY[0] != day:
+        _TODAY = (day, now.strftime("%Y-%m-%d"))
+    return _TODAY[1]
+
+def _float_or_nan(x):
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _to_float_array(videos, key):
+    """One float64 per video; missing or non-numeric values become NaN."""
+    return np.fromiter((_float_or_nan(v.get(key)) for v in videos), dtype=np.float64, count=len(videos))
+
+def _nanmean(a):
+    a = a[~np.isnan(a)]
+    return float(a.mean()) if a.size else 0.0
+
+# Parsed bullet fragments keyed by (text, style name); the same Top-5/Wins/recos text repeats every PDF
+_BULLET_FRAGS = {}
+_BULLET_FRAGS_MAX = 512
+
+def _bullet_frags(text, style):
+    key = (text, style.name)
+    frags = _BULLET_FRAGS.get(key)
+    if frags is None:
+        _, frags, _ = ParaParser().parse(cleanBlockQuotedText(text), style)
+        if frags is None:
+            return None  # let Paragraph raise its own parse error
+        textTransformFrags(frags, style)
+        if len(_BULLET_FRAGS) < _BULLET_FRAGS_MAX:
+            _BULLET_FRAGS[key] = frags
+    return frags
 
 def _wrap_bullets(items, styles):
+    style = styles["Body"]
     ps = []
     for it in items:
-        ps.append(Paragraph(f"• {_safe(it)}", styles["Body"]))
+        text = f"• {_safe(it)}"
+        ps.append(Paragraph(text, style, frags=_bullet_frags(text, style)))
     return ps
 
+GLOBAL_TOP5 = (
+    "Upgrade thumbnails for Top 5 videos to raise CTR by 1–2 pp.",
+    "Hook first 8–10s with outcome statement and visual motion.",
+    "Standardise descriptions: 250 words, keywords early, timestamps.",
+    "Pin comments with a question and link to next video or offer.",
+    "Post cadence: at least 1 long-form + 2 Shorts per week.",
+)
+VIDEO_WINS = (
+    "Strong audience retention on mid-video segments.",
+    "Above-average CTR compared to niche baseline.",
+    "Comments show clear product-market interest.",
+    "Titles match thumbnails, reducing bounce.",
+    "End screen clicks trending upward.",
+)
+DEFAULT_RECOS = (
+    "Target titles at 55–60 chars; front-load the primary keyword.",
+    "Add a mid-video cliffhanger at 40–60s to protect retention.",
+    "Use 2 end-screen elements and a pinned comment question.",
+    "Batch redesign thumbnails with consistent face, angle, and contrast.",
+    "Publish at a fixed weekly slot to train viewers.",
+)
+
+# Specific Improvements rules: (column, threshold, bullet markup); a bullet applies when value < threshold.
+# Missing values count as 0. Bullets are pre-escaped for Paragraph markup.
+IMPROVEMENT_RULES = tuple((f, t, "• " + escape(msg)) for f, t, msg in (
+    ("ctr", 3, "Increase CTR: tighten title to 55–60 chars and add a power word; refresh thumbnail with clear subject + contrast."),
+    ("seo_score", 70, "Expand description to 200–300 words with primary and 2–3 secondary keywords; add 3 tags matching search intent."),
+    ("watch_time_hours", 1, "Shorten intro to <10s and add an early promise; insert a pattern interrupt at 30–45s."),
+    ("desc_len", 100, "Add timestamps and a 2-line value proposition in the first 3 lines."),
+))
+_END_SCREEN_BULLET = "• " + escape("End screen: add 2 elements and a strong verbal CTA.")
+
+# Channel Health Score pillars and their weights (sum to 100)
+HEALTH_WEIGHTS = {"Content Optimization":25,"Engagement":20,"Consistency":15,"SEO/Discoverability":20,"Retention":20}
+
+def _health_pillars(views_a, likes_a, comments_a, avg_ctr, avg_seo, avg_wt):
+    """Pillar scores (0-100) and the weighted overall score from the per-video arrays and averages."""
+    pillars = {}
+    pillars["Content Optimization"] = min(100, avg_seo)  # proxy
+    # engagement proxy: likes+comments per 100 views over videos that have views
+    has_views = views_a > 0
+    er = (np.nan_to_num(likes_a[has_views]) + np.nan_to_num(comments_a[has_views])) / views_a[has_views] * 100
+    pillars["Engagement"] = max(0, min(100, float(er.mean())*2)) if er.size else max(0, min(100, avg_ctr))  # crude proxy
+    pillars["Consistency"] = 70  # fill from cadence later if available
+    pillars["SEO/Discoverability"] = min(100, avg_ctr*10) if avg_ctr else min(100, avg_seo*0.9)
+    pillars["Retention"] = min(100, 50 + (avg_wt*5))  # rough until AVD is wired
+    overall = sum(pillars[k]*HEALTH_WEIGHTS[k] for k in pillars)/100.0
+    return pillars, overall
+
+# Averages / Channel Health Score tables as one format template each ("label\tvalue" per line),
+# so every cell is filled by a single format call
+_AVG_FMT = (
+    "Average Views\t{avg_views:,.0f}\n"
+    "Average Watch Time (hrs)\t{avg_wt:.1f}\n"
+    "Average CTR\t{avg_ctr:.1f}%\n"
+    "Average SEO Score\t{avg_seo:.0f}/100"
+)
+_SCORE_FMT = "\n".join(["Overall\t{0:.0f}/100"] + [f"{k}\t{{{i}:.0f}}/100" for i, k in enumerate(HEALTH_WEIGHTS, 1)])
+
+def _fmt_rows(text):
+    return [line.split("\t") for line in text.split("\n")]
+
+_VIDEO_HEADERS = ("TITLE","DESCRIPTION","COMMENTS","LIKES","VIEWS","WATCH TIME (HRS)","CTR %","SEO SCORE /100","UPLOAD DATE")
+
+def _clip(x, n):
+    s = str(_safe(x))
+    return s if len(s) <= n else s[:n-1] + "…"
+
+def _video_row(v):
+    # title/description are clipped for the table cells only; Specific Improvements keeps full text
+    return (
+        _clip(v.get("title"), 60),
+        _clip(v.get("description"), 200),
+        _num(v.get("comments")),
+        _num(v.get("likes")),
+        _num(v.get("views")),
+        _hrs(v.get("watch_time_hours")),
+        _pct(v.get("ctr")),
+        _num(v.get("seo_score")),
+        _safe(v.get("upload_date")),
+    )
+
 def _draw_header(canvas, doc, channel_name, audit_date):
     canvas.saveState()
     canvas.setFillColor(NAVY_BG)
     canvas.rect(0, doc.height + doc.topMargin, doc.width + doc.leftMargin + doc.rightMargin, 40, fill=True, stroke=False)
     canvas.setFillColor(TEXT)
-    canvas.setFont("Helvetica-Bold", 12)
+    canvas.setFont(FONT_BOLD, 12)
     canvas.drawString(20, doc.height + doc.topMargin + 14, "YOUTUBE AUDIT PRO — Elite")
-    canvas.setFont("Helvetica", 9)
+    canvas.setFont(FONT, 9)
     right = doc.width + doc.leftMargin + doc.rightMargin - 20
     canvas.drawRightString(right, doc.height + doc.topMargin + 14, f"{_safe(channel_name)}")
     canvas.drawRightString(right, doc.height + doc.topMargin + 4, f"Audit: {audit_date}")
@@ -67,14 +279,32 @@ def _draw_footer(canvas, doc):
     canvas.setFillColor(PANEL_BG)
     canvas.rect(0, 0, doc.width + doc.leftMargin + doc.rightMargin, 28, fill=True, stroke=False)
     canvas.setFillColor(TEXT)
-    canvas.setFont("Helvetica", 8)
+    canvas.setFont(FONT, 8)
     canvas.drawString(20, 10, "Supportly • YouTube Audit Pro v2 • supportly.co.uk")
     canvas.drawRightString(doc.width + doc.leftMargin + doc.rightMargin - 20, 10, f"Page {doc.page}")
     canvas.restoreState()
 
+def _draw_page(canvas, doc):
+    _draw_header(canvas, doc, doc.channel_name, doc.audit_date)
+    _draw_footer(canvas, doc)
+
+class _AuditDocTemplate(BaseDocTemplate):
+    """A4 report doc with a single page template; its onPage draws header + footer from doc attributes."""
+    def __init__(self, filename, channel_name, audit_date):
+        # filename may be a path or a binary file-like; ReportLab writes either directly
+        margin = 14*mm
+        BaseDocTemplate.__init__(
+            self, filename, pagesize=A4,
+            leftMargin=margin, rightMargin=margin, topMargin=24*mm, bottomMargin=18*mm
+        )
+        self.channel_name = channel_name
+        self.audit_date = audit_date
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="normal")
+        self.addPageTemplates([PageTemplate(id="Page", frames=frame, onPage=_draw_page, pagesize=self.pagesize)])
+
 # ---------- public API ----------
 def build_youtube_audit_pdf(
-    out_path:str,
+    out,
     channel_info:dict,
     videos:list,
     ai_recos:list=None,
@@ -89,24 +319,22 @@ def build_youtube_audit_pdf(
     ai_recos: list[str]
     roadmap: {"7d":[...], "30d":[...], "60d":[...]}
 
-    Writes PDF to out_path. Returns out_path.
+    out: a file path, or a binary file-like (BytesIO, an HTTP response stream) to skip disk IO.
+    Writes the PDF to out. Returns out.
     """
-    # Styles
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name="H1", fontName="Helvetica-Bold", fontSize=14, textColor=SUPPORTLY_BLUE, spaceAfter=6))
-    styles.add(ParagraphStyle(name="H2", fontName="Helvetica-Bold", fontSize=11, textColor=SUPPORTLY_BLUE, spaceBefore=6, spaceAfter=4))
-    styles.add(ParagraphStyle(name="Body", fontName="Helvetica", fontSize=9, textColor=colors.black, leading=12))
-    styles.add(ParagraphStyle(name="Small", fontName="Helvetica", fontSize=8, textColor=colors.black, leading=11))
-    styles.add(ParagraphStyle(name="Muted", fontName="Helvetica-Oblique", fontSize=8, textColor=colors.grey))
-
-    margin = 14*mm
-    doc = SimpleDocTemplate(
-        out_path,
-        pagesize=A4,
-        leftMargin=margin, rightMargin=margin, topMargin=24*mm, bottomMargin=18*mm
-    )
+    styles = STYLES
+
+    # Videos as columns (SoA): each field is pulled out once and later sections read the arrays
+    titles = [v.get("title") for v in videos]
+    views_a = _to_float_array(videos, "views")
+    likes_a = _to_float_array(videos, "likes")
+    comments_a = _to_float_array(videos, "comments")
+    wt_a = _to_float_array(videos, "watch_time_hours")
+    ctr_a = _to_float_array(videos, "ctr")
+    seo_a = _to_float_array(videos, "seo_score")
     channel_name = _safe(channel_info.get("name","Channel"))
-    audit_date = _safe(channel_info.get("date") or datetime.utcnow().strftime("%Y-%m-%d"))
+    audit_date = _safe(channel_info.get("date") or _utc_today())
+    doc = _AuditDocTemplate(out, channel_name, audit_date)
     story = []
 
     # Header block (text cards)
@@ -118,203 +346,96 @@ def build_youtube_audit_pdf(
     ]
     story.append(Paragraph("Channel Overview", styles["H1"]))
     t = Table(kpis, hAlign="LEFT", colWidths=[45*mm, None])
-    t.setStyle(TableStyle([
-        ("BOX", (0,0), (-1,-1), 0.5, colors.HexColor("#dddddd")),
-        ("INNERGRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f6f8ff")),
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-        ("TEXTCOLOR", (0,0), (0,-1), colors.HexColor("#333333")),
-    ]))
+    t.setStyle(_KPI_STYLE)
     story.extend([t, Spacer(1,6)])
 
     # Video performance table
     story.append(Paragraph("Video Performance", styles["H1"]))
-    headers = ["TITLE","DESCRIPTION","COMMENTS","LIKES","VIEWS","WATCH TIME (HRS)","CTR %","SEO SCORE /100","UPLOAD DATE"]
-    rows = [headers]
-    for v in videos:
-        rows.append([
-            _safe(v.get("title")),
-            _safe(v.get("description")),
-            _num(v.get("comments")),
-            _num(v.get("likes")),
-            _num(v.get("views")),
-            _hrs(v.get("watch_time_hours")),
-            _pct(v.get("ctr")),
-            _num(v.get("seo_score")),
-            _safe(v.get("upload_date")),
-        ])
-    # wide table with dynamic height
+    rows = [_VIDEO_HEADERS, *map(_video_row, videos)]
+    # wide table with dynamic height; LongTable lays rows out in one pass when it spans pages
     col_widths = [45*mm, 60*mm, 20*mm, 20*mm, 22*mm, 30*mm, 18*mm, 28*mm, 26*mm]
-    vt = Table(rows, colWidths=col_widths, repeatRows=1)
-    vt.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 8),
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eaf4ff")),
-        ("TEXTCOLOR", (0,0), (-1,0), colors.HexColor("#00395b")),
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#cfd7e6")),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-    ]))
+    vt = LongTable(rows, colWidths=col_widths, repeatRows=1, splitByRow=1)
+    vt.setStyle(_VIDEO_TABLE_STYLE)
     story.extend([vt, Spacer(1,8)])
 
     # Insights under table
-    by_views = sorted(videos, key=lambda x: float(x.get("views",0) or 0), reverse=True)
-    highest = by_views[0]["title"] if by_views else "—"
-    lowest = by_views[-1]["title"] if len(by_views) > 0 else "—"
-    engagements = [_safe(v.get("likes",0),0) for v in videos]  # proxy if no ER/video
+    # missing views rank as 0; the lowest pick takes the last of any ties, as the old stable sort did
+    views0 = np.nan_to_num(views_a)
+    highest = titles[int(np.argmax(views0))] if videos else "—"
+    lowest = titles[len(titles) - 1 - int(np.argmin(views0[::-1]))] if videos else "—"
+    # likes as the engagement proxy (no ER per video); mean and max taken from the one likes column
+    likes_known = likes_a[~np.isnan(likes_a)]
     variance = "—"
-    try:
-        mn = _avg([float(x) for x in engagements if x != "—"])
-        mx = max([float(x) for x in engagements if x != "—"]) if engagements else 0
+    if likes_known.size:
+        mn = float(likes_known.mean())
+        mx = float(likes_known.max())
         variance = f"{((mx - mn) / (mn or 1))*100:.1f}%"
-    except:
-        pass
     insight_tbl = Table([
         ["Highest-performing video", highest],
         ["Lowest-performing video", lowest],
         ["Engagement variance", variance],
     ], colWidths=[60*mm, None])
-    insight_tbl.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
-        ("BACKGROUND", (0,0), (-1,-1), colors.HexColor("#fafafa")),
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-    ]))
+    insight_tbl.setStyle(_INSIGHT_STYLE)
     story.extend([insight_tbl, Spacer(1,10)])
 
     # Specific improvements per video
     story.append(Paragraph("Specific Improvements", styles["H1"]))
-    for v in videos:
-        story.append(Paragraph(f"{_safe(v.get('title'))}", styles["H2"]))
-        bullets = []
-        # rule-based suggestions
-        ctr = float(v.get("ctr") or 0)
-        seo = float(v.get("seo_score") or 0)
-        wt = float(v.get("watch_time_hours") or 0)
-        desc = v.get("description") or ""
-        if ctr < 3:
-            bullets.append("Increase CTR: tighten title to 55–60 chars and add a power word; refresh thumbnail with clear subject + contrast.")
-        if seo < 70:
-            bullets.append("Expand description to 200–300 words with primary and 2–3 secondary keywords; add 3 tags matching search intent.")
-        if wt < 1:
-            bullets.append("Shorten intro to <10s and add an early promise; insert a pattern interrupt at 30–45s.")
-        if len(desc) < 100:
-            bullets.append("Add timestamps and a 2-line value proposition in the first 3 lines.")
-        bullets.append("End screen: add 2 elements and a strong verbal CTA.")
-        story.extend(_wrap_bullets(bullets, styles))
+    # rule-based suggestions: every threshold evaluated once over the columns, then rows picked per video
+    desc_len = np.fromiter((len(v.get("description") or "") for v in videos), dtype=np.int64, count=len(videos))
+    rule_cols = {"ctr": ctr_a, "seo_score": seo_a, "watch_time_hours": wt_a, "desc_len": desc_len}
+    hits = np.column_stack([np.nan_to_num(rule_cols[f]) < t for f, t, _ in IMPROVEMENT_RULES])
+    for title, row in zip(titles, hits):
+        bullets = [b for (_, _, b), hit in zip(IMPROVEMENT_RULES, row) if hit]
+        bullets.append(_END_SCREEN_BULLET)
+        # one flowable per video: heading + bullets joined with <br/> instead of ~6 separate Paragraphs
+        html = f'<font color="{_BLUE_HEX}"><b>{escape(str(_safe(title)))}</b></font><br/>' + "<br/>".join(bullets)
+        story.append(Paragraph(html, styles["Body"]))
         story.append(Spacer(1,4))
     story.append(Spacer(1,6))
 
     # Improvement summary (Top 5 global)
     story.append(Paragraph("Improvement Summary", styles["H1"]))
-    global_top5 = [
-        "Upgrade thumbnails for Top 5 videos to raise CTR by 1–2 pp.",
-        "Hook first 8–10s with outcome statement and visual motion.",
-        "Standardise descriptions: 250 words, keywords early, timestamps.",
-        "Pin comments with a question and link to next video or offer.",
-        "Post cadence: at least 1 long-form + 2 Shorts per week.",
-    ]
-    story.extend(_wrap_bullets(global_top5, styles))
+    story.extend(_wrap_bullets(GLOBAL_TOP5, styles))
     story.append(Spacer(1,6))
 
     # Video wins
     story.append(Paragraph("Video Wins", styles["H1"]))
-    wins = [
-        "Strong audience retention on mid-video segments.",
-        "Above-average CTR compared to niche baseline.",
-        "Comments show clear product-market interest.",
-        "Titles match thumbnails, reducing bounce.",
-        "End screen clicks trending upward.",
-    ]
-    story.extend(_wrap_bullets(wins, styles))
+    story.extend(_wrap_bullets(VIDEO_WINS, styles))
     story.append(Spacer(1,6))
 
     # Top keywords (aggregate)
     story.append(Paragraph("Top Keywords (AI-Derived)", styles["H1"]))
     kw_rows = [["Keyword","Volume","Difficulty","Ranking Video","CTR %"]]
-    for v in videos[:5]:
-        kws = v.get("keywords") or []
-        if not kws: 
-            continue
-        for k in kws[:2]:
-            kw_rows.append([_safe(k), "—", "—", _safe(v.get("title")), _pct(v.get("ctr"))])
+    # first 2 keywords of the first 5 videos, flattened in one generator
+    pairs = ((k, v) for v in islice(videos, 5) for k in (v.get("keywords") or ())[:2])
+    kw_rows.extend([_safe(k), "—", "—", _safe(v.get("title")), _pct(v.get("ctr"))] for k, v in pairs)
     if len(kw_rows) == 1:
         kw_rows.append(["—","—","—","—","—"])
     kwt = Table(kw_rows, repeatRows=1, colWidths=[50*mm, 22*mm, 22*mm, 65*mm, 18*mm])
-    kwt.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#cfd7e6")),
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eaf4ff")),
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 8),
-        ("VALIGN", (0,0), (-1,-1), "TOP"),
-    ]))
+    kwt.setStyle(_KW_STYLE)
     story.extend([kwt, Spacer(1,8)])
 
     # Averages
     story.append(Paragraph("Averages", styles["H1"]))
-    avg_views = _avg([v.get("views") for v in videos])
-    avg_wt = _avg([v.get("watch_time_hours") for v in videos])
-    avg_ctr = _avg([v.get("ctr") for v in videos])
-    avg_seo = _avg([v.get("seo_score") for v in videos])
-    avg_tbl = Table([
-        ["Average Views", f"{avg_views:,.0f}"],
-        ["Average Watch Time (hrs)", f"{avg_wt:.1f}"],
-        ["Average CTR", f"{avg_ctr:.1f}%"],
-        ["Average SEO Score", f"{avg_seo:.0f}/100"],
-    ], colWidths=[70*mm, None])
-    avg_tbl.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
-        ("BACKGROUND", (0,0), (-1,-1), colors.HexColor("#fafafa")),
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-    ]))
+    avg_views = _nanmean(views_a)
+    avg_wt = _nanmean(wt_a)
+    avg_ctr = _nanmean(ctr_a)
+    avg_seo = _nanmean(seo_a)
+    avg_text = _AVG_FMT.format_map({"avg_views": avg_views, "avg_wt": avg_wt, "avg_ctr": avg_ctr, "avg_seo": avg_seo})
+    avg_tbl = Table(_fmt_rows(avg_text), colWidths=[70*mm, None])
+    avg_tbl.setStyle(_AVG_STYLE)
     story.extend([avg_tbl, Spacer(1,8)])
 
-    # Channel Health Score (weighted)
-    # Pillars: Content Optimization 25, Engagement 20, Consistency 15, SEO 20, Retention 20
-    pillars = {}
-    pillars["Content Optimization"] = min(100, avg_seo)  # proxy
-    # engagement proxy: likes+comments per 1k views if data present
-    try:
-        er_list = []
-        for v in videos:
-            likes = float(v.get("likes") or 0)
-            comments = float(v.get("comments") or 0)
-            views = float(v.get("views") or 0)
-            if views > 0:
-                er_list.append((likes+comments)/views*100)
-        pillars["Engagement"] = max(0, min(100, (_avg(er_list)*2))) if er_list else max(0, min(100, avg_ctr))  # crude proxy
-    except:
-        pillars["Engagement"] = max(0, min(100, avg_ctr))
-    pillars["Consistency"] = 70  # fill from cadence later if available
-    pillars["SEO/Discoverability"] = min(100, avg_ctr*10) if avg_ctr else min(100, avg_seo*0.9)
-    pillars["Retention"] = min(100, 50 + (avg_wt*5))  # rough until AVD is wired
-
-    weights = {"Content Optimization":25,"Engagement":20,"Consistency":15,"SEO/Discoverability":20,"Retention":20}
-    overall = sum(pillars[k]*weights[k] for k in pillars)/100.0
+    pillars, overall = _health_pillars(views_a, likes_a, comments_a, avg_ctr, avg_seo, avg_wt)
     story.append(Paragraph("Channel Health Score", styles["H1"]))
-    score_tbl = [["Overall", f"{overall:.0f}/100"]]
-    for k in weights:
-        score_tbl.append([k, f"{pillars[k]:.0f}/100"])
-    stbl = Table(score_tbl, colWidths=[70*mm, None])
-    stbl.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.25, colors.HexColor("#e6e6e6")),
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f6f8ff")),
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-    ]))
+    score_text = _SCORE_FMT.format(overall, *(pillars[k] for k in HEALTH_WEIGHTS))
+    stbl = Table(_fmt_rows(score_text), colWidths=[70*mm, None])
+    stbl.setStyle(_SCORE_STYLE)
     story.extend([stbl, Spacer(1,8)])
 
     # AI recommendations
     story.append(Paragraph("AI-Generated Recommendations", styles["H1"]))
-    default_recos = [
-        "Target titles at 55–60 chars; front-load the primary keyword.",
-        "Add a mid-video cliffhanger at 40–60s to protect retention.",
-        "Use 2 end-screen elements and a pinned comment question.",
-        "Batch redesign thumbnails with consistent face, angle, and contrast.",
-        "Publish at a fixed weekly slot to train viewers."
-    ]
-    story.extend(_wrap_bullets(ai_recos or default_recos, styles))
+    story.extend(_wrap_bullets(ai_recos or DEFAULT_RECOS, styles))
     story.append(Spacer(1,8))
 
     # Roadmap
@@ -331,17 +452,36 @@ def build_youtube_audit_pdf(
         story.extend(_wrap_bullets(items, styles))
         story.append(Spacer(1,4))
 
-    # Build
-    def on_first_page(canvas, doc):
-        _draw_header(canvas, doc, channel_name, audit_date)
-        _draw_footer(canvas, doc)
+    doc.build(story)
+    return out
 
-    def on_later_pages(canvas, doc):
-        _draw_header(canvas, doc, channel_name, audit_date)
-        _draw_footer(canvas, doc)
+def _build_job(job):
+    out, rest = job[0], job[1:]
+    if out is None:
+        # file-like target stays in the parent; ship the bytes back instead
+        buf = io.BytesIO()
+        build_youtube_audit_pdf(buf, *rest)
+        return buf.getvalue()
+    return build_youtube_audit_pdf(out, *rest)
 
-    doc.build(story, onFirstPage=on_first_page, onLaterPages=on_later_pages)
-    return out_path
+def build_youtube_audit_pdfs_parallel(jobs, workers=None):
+    """
+    Batch variant: jobs is a list of build_youtube_audit_pdf argument tuples
+    (out, channel_info, videos[, ai_recos, roadmap]). Layout is CPU-bound and holds
+    the GIL, so PDFs are built in a process pool. out may be a path or a binary file-like;
+    file-likes can't cross the process boundary, so workers return the PDF bytes and they
+    are written into the caller's object here. Returns the outs in job order.
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1 or workers == 1:
+        return [build_youtube_audit_pdf(*job) for job in jobs]
+    outs = [job[0] for job in jobs]
+    sent = [((None,) + tuple(job[1:])) if hasattr(out, "write") else job for out, job in zip(outs, jobs)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for out, res in zip(outs, ex.map(_build_job, sent)):
+            if hasattr(out, "write"):
+                out.write(res)
+    return outs
 
 # -------------- Streamlit usage example --------------
 if __name__ == "__main__":